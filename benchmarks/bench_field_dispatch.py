@@ -0,0 +1,166 @@
+"""
+Benchmark: schema-driven block parsing vs. the old if/elif chains
+
+Run from the project root:
+    python benchmarks/bench_field_dispatch.py [record_count]
+"""
+
+import sys
+import os
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# PREVIOUS IMPLEMENTATION (kept here for comparison only)
+# ============================================================================
+
+def legacy_parse_quest_block(lines):
+    """The if/elif chain parse_quest_block used before the schema registry"""
+    quest = {}
+    try:
+        for line in lines:
+            if ":" not in line:
+                raise InvalidDataFormatError(f"Invalid line format: {line}")
+            key, value = line.split(":", 1)
+            key = key.strip().upper()
+            value = value.strip()
+
+            if key == "QUEST_ID":
+                quest["quest_id"] = value
+            elif key == "TITLE":
+                quest["title"] = value
+            elif key == "DESCRIPTION":
+                quest["description"] = value
+            elif key == "REWARD_XP":
+                quest["reward_xp"] = int(value)
+            elif key == "REWARD_GOLD":
+                quest["reward_gold"] = int(value)
+            elif key == "REQUIRED_LEVEL":
+                quest["required_level"] = int(value)
+            elif key == "PREREQUISITE":
+                quest["prerequisite"] = None if value.upper() == "NONE" else value
+            else:
+                raise InvalidDataFormatError(f"Unexpected field: {key}")
+
+        fields = ["quest_id", "title", "description", "reward_xp",
+                    "reward_gold", "required_level", "prerequisite"]
+        for field in fields:
+            if field not in quest:
+                raise InvalidDataFormatError(f"Missing field: {field}")
+
+        return quest
+
+    except ValueError:
+        raise InvalidDataFormatError("Can not parse field")
+    except Exception as e:
+        raise InvalidDataFormatError(f"Error parsing quest block: {e}")
+
+def legacy_parse_item_block(lines):
+    """The if/elif chain parse_item_block used before the schema registry"""
+    item = {}
+    try:
+        for line in lines:
+            if ":" not in line:
+                raise InvalidDataFormatError(f"Invalid line format: {line}")
+            key, value = line.split(":", 1)
+            key = key.strip().upper()
+            value = value.strip()
+
+            if key == "ITEM_ID":
+                item["item_id"] = value
+            elif key == "NAME":
+                item["name"] = value
+            elif key == "TYPE":
+                if value.lower() not in ["weapon", "armor", "consumable"]:
+                    raise InvalidDataFormatError(f"Invalid item type: {value}")
+                item["type"] = value.lower()
+            elif key == "EFFECT":
+                if ":" not in value:
+                    raise InvalidDataFormatError(f"Invalid effect format: {value}")
+                stat, amount = value.split(":", 1)
+                item["effect"] = {stat.strip().lower(): int(amount.strip())}
+            elif key == "COST":
+                item["cost"] = int(value)
+            elif key == "DESCRIPTION":
+                item["description"] = value
+            else:
+                raise InvalidDataFormatError(f"Unexpected field: {key}")
+
+        fields = ["item_id", "name", "type", "effect", "cost", "description"]
+        for field in fields:
+            if field not in item:
+                raise InvalidDataFormatError(f"Missing field: {field}")
+
+        return item
+
+    except ValueError:
+        raise InvalidDataFormatError("Can not parse field")
+    except Exception as e:
+        raise InvalidDataFormatError(f"Error parsing item block: {e}")
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def make_quest_blocks(count):
+    """Generate quest blocks shaped like data/quests.txt"""
+    blocks = []
+    for i in range(count):
+        blocks.append([
+            f"QUEST_ID: quest_{i}",
+            f"TITLE: Quest Number {i}",
+            "DESCRIPTION: Defeat the monsters that roam the countryside",
+            f"REWARD_XP: {50 + i % 500}",
+            f"REWARD_GOLD: {25 + i % 250}",
+            f"REQUIRED_LEVEL: {1 + i % 50}",
+            "PREREQUISITE: NONE" if i == 0 else f"PREREQUISITE: quest_{i - 1}",
+        ])
+    return blocks
+
+def make_item_blocks(count):
+    """Generate item blocks shaped like data/items.txt"""
+    blocks = []
+    for i in range(count):
+        blocks.append([
+            f"ITEM_ID: item_{i}",
+            f"NAME: Item Number {i}",
+            "TYPE: weapon",
+            f"EFFECT: strength:{1 + i % 20}",
+            f"COST: {10 + i % 1000}",
+            "DESCRIPTION: A weapon forged for testing",
+        ])
+    return blocks
+
+def time_parser(parser, blocks, repeat=5):
+    """Return the best time in seconds to parse every block once"""
+    def run():
+        for block in blocks:
+            parser(block)
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    quest_blocks = make_quest_blocks(count)
+    item_blocks = make_item_blocks(count)
+
+    # Both parsers must agree before their speed means anything
+    assert legacy_parse_quest_block(quest_blocks[1]) == game_data.parse_quest_block(quest_blocks[1])
+    assert legacy_parse_item_block(item_blocks[1]) == game_data.parse_item_block(item_blocks[1])
+
+    print(f"Parsing {count} records of each kind")
+    for label, legacy, current, blocks in [
+        ("quests", legacy_parse_quest_block, game_data.parse_quest_block, quest_blocks),
+        ("items", legacy_parse_item_block, game_data.parse_item_block, item_blocks),
+    ]:
+        legacy_time = time_parser(legacy, blocks)
+        current_time = time_parser(current, blocks)
+        print(f"{label:>6}: if/elif chain {legacy_time:.3f}s, "
+              f"schema {current_time:.3f}s, "
+              f"speedup {legacy_time / current_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: memory used by Quest/Item records vs. plain dictionaries
+
+Run from the project root:
+    python benchmarks/bench_record_memory.py [record_count]
+"""
+
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+QUEST_TYPES = ["main", "side", "daily", "guild"]
+ITEM_TYPES = list(game_data.VALID_ITEM_TYPES)
+STATS = ["health", "max_health", "strength", "magic"]
+
+def make_quest_dicts(count):
+    """Generate quest dictionaries as the block parser returns them"""
+    quests = {}
+    for i in range(count):
+        quest_id = f"quest_{i}"
+        quests[quest_id] = {
+            "quest_id": quest_id,
+            "title": f"Quest Number {i}",
+            "description": f"Help the {QUEST_TYPES[i % 4]} guild with task {i}",
+            "reward_xp": 50 + i % 500,
+            "reward_gold": 25 + i % 250,
+            "required_level": 1 + i % 50,
+            "prerequisite": None if i == 0 else f"quest_{i - 1}",
+        }
+    return quests
+
+def make_item_dicts(count):
+    """Generate item dictionaries as the block parser returns them"""
+    items = {}
+    for i in range(count):
+        item_id = f"item_{i}"
+        items[item_id] = {
+            "item_id": item_id,
+            "name": f"Item Number {i}",
+            "type": ITEM_TYPES[i % 3],
+            "effect": {STATS[i % 4]: 1 + i % 20},
+            "cost": 10 + i % 1000,
+            "description": f"A {ITEM_TYPES[i % 3]} forged for test {i}",
+        }
+    return items
+
+def measure(build):
+    """Return (result, bytes still allocated by build) using tracemalloc"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    print(f"Catalog of {count} quests and {count} items")
+
+    for label, make, record_type in [
+        ("quests", make_quest_dicts, game_data.Quest),
+        ("items", make_item_dicts, game_data.Item),
+    ]:
+        # Both sides are measured from the same generated text so only the
+        # container representation differs. Each side owns its own strings.
+        dicts, dict_bytes = measure(lambda: make(count))
+        del dicts
+        records, record_bytes = measure(
+            lambda: {key: record_type.from_dict(value) for key, value in make(count).items()}
+        )
+        del records
+        print(f"{label:>6}: dicts {dict_bytes / 1e6:.1f} MB, "
+              f"records {record_bytes / 1e6:.1f} MB, "
+              f"saved {100 * (1 - record_bytes / dict_bytes):.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: text vs. binary save files (size on disk and load time)
+
+Run from the project root:
+    python benchmarks/bench_save_format.py [character_count]
+"""
+
+import sys
+import os
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+ITEMS = ["health_potion", "iron_sword", "leather_armor", "mana_potion", "steel_sword"]
+QUESTS = ["first_steps", "goblin_hunter", "equipment_upgrade", "dragon_slayer", "lost_relic"]
+
+def make_characters(count):
+    """Generate characters with a few items and quests each"""
+    characters = []
+    for i in range(count):
+        character = character_manager.create_character(f"Hero{i}", CLASSES[i % 4])
+        character["level"] = 1 + i % 50
+        character["experience"] = i % 1000
+        character["gold"] = 100 + i * 7 % 10000
+        character["inventory"] = ITEMS[:i % 6]
+        character["active_quests"].extend(QUESTS[i % 5:i % 5 + 1])
+        character["completed_quests"].extend(QUESTS[:i % 5])
+        characters.append(character)
+    return characters
+
+def save_all(characters, directory, binary):
+    """Save every character in one format and return the bytes written"""
+    previous = character_manager.set_binary_saves(binary)
+    try:
+        character_manager.save_characters(characters, directory)
+    finally:
+        character_manager.set_binary_saves(previous)
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+def time_loads(names, directory, repeat=5):
+    """Return the best time in seconds to load every character once"""
+    return min(timeit.repeat(
+        lambda: character_manager.load_characters(names, directory), number=1, repeat=repeat))
+
+def time_parses(blobs, repeat=5):
+    """Return the best time in seconds to parse every save in memory once"""
+    def run():
+        for data in blobs:
+            character_manager._parse_save(data)
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    characters = make_characters(count)
+    names = [character["name"] for character in characters]
+    text_blobs = [character_manager._format_save(c).encode("utf-8") for c in characters]
+    binary_blobs = [character_manager._format_binary_save(c) for c in characters]
+
+    # Both formats must load back the same characters before timing them
+    assert character_manager._parse_save(binary_blobs[7]) == character_manager._parse_save(text_blobs[7])
+
+    print(f"{count} characters")
+    with tempfile.TemporaryDirectory() as text_dir, tempfile.TemporaryDirectory() as binary_dir:
+        text_size = save_all(characters, text_dir, False)
+        binary_size = save_all(characters, binary_dir, True)
+        text_load = time_loads(names, text_dir)
+        binary_load = time_loads(names, binary_dir)
+
+    text_parse = time_parses(text_blobs)
+    binary_parse = time_parses(binary_blobs)
+    print(f"  size: text {text_size / 1e6:.2f} MB, binary {binary_size / 1e6:.2f} MB, "
+          f"{text_size / binary_size:.2f}x smaller")
+    print(f" parse: text {text_parse:.3f}s, binary {binary_parse:.3f}s, "
+          f"speedup {text_parse / binary_parse:.2f}x")
+    print(f"  load: text {text_load:.3f}s, binary {binary_load:.3f}s, "
+          f"speedup {text_load / binary_load:.2f}x (includes opening each file)")
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,23 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import hashlib
+import mmap
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from math import isqrt
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
-    CharacterDeadError
+    CharacterDeadError,
+    CharacterVersionConflictError
 )
 
 # ============================================================================
@@ -48,7 +59,7 @@ def create_character(name, character_class):
    
     stats = base_stats[character_class]
     
-    character = {
+    character = TrackedCharacter({
         "name": name,
         "class": character_class,
         "level": 1,
@@ -58,10 +69,10 @@ def create_character(name, character_class):
         "magic": stats["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+        "inventory": Inventory(),
+        "active_quests": QuestList(),
+        "completed_quests": QuestList()
+    })
     
     return character
     pass
@@ -86,31 +97,39 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    The file is written to a temporary file in the same directory, synced
+    and renamed over the old save, so a crash leaves either the old or
+    the new save and never a truncated one. Inside batched_saves() the
+    sync and rename are deferred to the end of the batch.
+    
+    When a save backend is configured (see set_save_backend) the
+    character is saved there instead and save_directory is ignored.
+    After set_binary_saves(True) the file is written in the binary save
+    format instead; load_character reads either.
+    
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
     if not isinstance(character, dict) or "name" not in character:
         return False
+    if _save_backend is not None:
+        _save_backend.save(character)
+        return True
     if not os.path.exists(save_directory):
         os.makedirs(save_directory, exist_ok=True)
     
-    file_name = os.path.join(save_directory, f"{character['name']}_save.txt")
+    sharded = _is_sharded(save_directory)
+    file_name = _save_path(character["name"], save_directory, sharded)
     
     try:
-        with open(file_name, "w", encoding="utf-8") as file:
-            file.write(f"Name: {character['name']}\n")
-            file.write(f"Class: {character['class']}\n")
-            file.write(f"Level: {character['level']}\n")
-            file.write(f"Health: {character['health']}\n")
-            file.write(f"Max_Health: {character['max_health']}\n")
-            file.write(f"Strength: {character['strength']}\n")
-            file.write(f"Magic: {character['magic']}\n")
-            file.write(f"Experience: {character['experience']}\n")
-            file.write(f"Gold: {character['gold']}\n")
-            file.write(f"Inventory: {','.join(character['inventory'])}\n")
-            file.write(f"Active_Quests: {','.join(character['active_quests'])}\n")
-            file.write(f"Completed_Quests: {','.join(character['completed_quests'])}\n")
-        
+        on_replace = None
+        if sharded:
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+            if not os.path.exists(file_name):
+                on_replace = lambda: _added_to_shard(save_directory, character["name"])
+        data = _format_binary_save(character) if _binary_saves else _format_save(character)
+        _write_atomic(file_name, data, on_replace)
+        _mark_saved(character, None)
         return True
 
     except (PermissionError, IOError):     
@@ -118,6 +137,27 @@ def save_character(character, save_directory="data/save_games"):
     pass
 
 
+def save_characters(characters, save_directory="data/save_games"):
+    """
+    Save many characters at once
+    
+    A configured save backend with a save_many method (such as
+    SQLiteSaveStore) writes them all in one transaction. Otherwise each
+    character is saved with save_character inside batched_saves(), so the
+    whole list shares one disk sync.
+    
+    Returns: True if successful
+    """
+    characters = [c for c in characters if isinstance(c, dict) and "name" in c]
+    if _save_backend is not None and hasattr(_save_backend, "save_many"):
+        _save_backend.save_many(characters)
+        return True
+
+    with batched_saves():
+        for character in characters:
+            save_character(character, save_directory)
+    return True
+
 def load_character(character_name, save_directory="data/save_games"):
     """
     Load character from save file
@@ -132,64 +172,90 @@ def load_character(character_name, save_directory="data/save_games"):
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """
-
-    file_name = os.path.join(save_directory, f"{character_name}_save.txt")
-    if not os.path.exists(file_name):
-        raise CharacterNotFoundError(f"No save file found for {character_name}")
-    try:
-        with open(file_name, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-    except (PermissionError, IOError):
-        raise SaveFileCorruptedError(f"Could not read file for {character_name}")
-
-    character = {}
-    try:
-        for line in lines:
-            key, value = line.strip().split(":", 1)
-            key = key.strip()
-            value = value.strip()
-            
-            if key in ["Level", "Health", "Max_Health", "Strength", "Magic", "Experience", "Gold"]:
-                character[key.lower()] = int(value)
-            elif key in ["Inventory", "Active_Quests", "Completed_Quests"]:
-                character[key.lower()] = value.split(",") if value else []
-            elif key in ["Name", "Class"]:
-                character[key.lower()] = value
-            else:
-                raise InvalidSaveDataError(f"Wrong field {key} in save file.")
-        
-        fields = [
-            "name", "class", "level", "health", "max_health", "strength", "magic", 
-            "experience", "gold", "inventory", "active_quests", "completed_quests"
-        ]
-        for field in fields:
-            if field not in character:
-                raise InvalidSaveDataError(f"Missing {field} in save file")
-
-    except ValueError:
-        raise InvalidSaveDataError("Save file format is invalid")
-    
+    if _save_backend is not None:
+        character = _save_backend.load(character_name)
+    else:
+        data = _read_save(character_name, save_directory, _is_sharded(save_directory))
+        character = _parse_save(data)
+    if isinstance(character, TrackedCharacter):
+        character.version = _save_versions.get((_save_location(save_directory), character_name), 0)
     return character
     pass
 
-def list_saved_characters(save_directory="data/save_games"):
+def load_characters(character_names, save_directory="data/save_games"):
     """
-    Get list of all saved character names
+    Load many characters at once
     
-    Returns: List of character names (without _save.txt extension)
+    Args:
+        character_names: Names of the characters to load
+        save_directory: Directory containing save files
+    
+    One character that is missing or unreadable does not stop the rest.
+    The directory layout is checked once for the whole list, and each
+    save is opened directly instead of being looked up first.
+    
+    Returns: Dictionary {name: character dictionary, or the
+             CharacterNotFoundError / SaveFileCorruptedError /
+             InvalidSaveDataError raised for it}
     """
-    if not os.path.exists(save_directory):
-        return []
+    characters = {}
+    if _save_backend is not None:
+        load_many = getattr(_save_backend, "load_many", None)
+        if load_many is not None:
+            return load_many(character_names)
+        for name in character_names:
+            try:
+                characters[name] = _save_backend.load(name)
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+                characters[name] = e
+        return characters
+
+    sharded = _is_sharded(save_directory)
+    location = _save_location(save_directory)
+    for name in character_names:
+        try:
+            character = _parse_save(_read_save(name, save_directory, sharded))
+            character.version = _save_versions.get((location, name), 0)
+            characters[name] = character
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            characters[name] = e
+    return characters
+
+def list_saved_characters(save_directory="data/save_games", offset=0, limit=None):
+    """
+    Get list of all saved character names
     
-    try:
-        file = os.listdir(save_directory)
-    except (PermissionError, IOError):
-        raise
+    Args:
+        save_directory: Directory containing save files
+        offset: Number of names to skip, for paging
+        limit: Largest number of names to return (None for all)
     
-    save_list = [f for f in file if f.endswith("_save.txt")]
+    A sharded directory (see migrate_flat_saves) is listed from its index
+    file in save order without touching the save files; a page costs only
+    the index entries appended since the last listing (see _read_index).
+    A configured save backend is listed instead of save_directory.
     
-    saved_character = [f.replace("_save.txt", "") for f in save_list]
+    Returns: List of character names (without _save.txt extension)
+    """
+    if _save_backend is not None:
+        saved_character = _save_backend.names()
+    elif not os.path.exists(save_directory):
+        return []
+    elif _is_sharded(save_directory):
+        return _read_index(save_directory, offset, limit)
+    else:
+        try:
+            file = os.listdir(save_directory)
+        except (PermissionError, IOError):
+            raise
+        
+        save_list = [f for f in file if f.endswith("_save.txt")]
+        
+        saved_character = [f.replace("_save.txt", "") for f in save_list]
     
+    if offset or limit is not None:
+        end = None if limit is None else offset + limit
+        saved_character = saved_character[offset:end]
     return saved_character
     pass
 
@@ -200,12 +266,17 @@ def delete_character(character_name, save_directory="data/save_games"):
     Returns: True if deleted successfully
     Raises: CharacterNotFoundError if character doesn't exist
     """
-    file_name = os.path.join(save_directory, f"{character_name}_save.txt")
-    if not os.path.exists(file_name):
+    if _save_backend is not None:
+        return _save_backend.delete(character_name)
+
+    file_name = _find_save(character_name, save_directory)
+    if file_name is None:
         raise CharacterNotFoundError
     
     try:
         os.remove(file_name)
+        if _is_sharded(save_directory):
+            _append_index(save_directory, "-", character_name)
         return True
     except (PermissionError, IOError):
         raise
@@ -227,23 +298,89 @@ def gain_experience(character, xp_amount):
     - Increase magic by 2
     - Restore health to max_health
     
+    Any number of level ups is applied in one step (see _levels_gained).
+    
+    Returns: Level up report dictionary:
+             {"old_level", "new_level", "levels_gained", "experience",
+              "max_health", "strength", "magic"}
+             where the last three are the stat increases
     Raises: CharacterDeadError if character health is 0
     """
     if character["health"] <= 0:
         raise CharacterDeadError(f"{character["name"]} is dead")
 
-    character["experience"] += xp_amount
+    return _apply_experience(character, character["experience"] + xp_amount)
+    pass
 
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
-        character["health"] = character["max_health"]
+def gain_experience_bulk(characters, xp_amounts):
+    """
+    Add experience to many characters in one call
+    
+    Args:
+        characters: List of character dictionaries
+        xp_amounts: List of experience amounts, one per character
+    
+    A character may appear more than once: its grants are added up and
+    applied in a single level up step, and each of its positions gets the
+    same combined report. A dead character does not stop the batch.
+    
+    Returns: List with one entry per character, in order: the level up
+             report from gain_experience, or the CharacterDeadError
+             raised for it
+    """
+    totals = {}
+    for character, xp_amount in zip(characters, xp_amounts):
+        key = id(character)
+        if key in totals:
+            totals[key][1] += xp_amount
+        else:
+            totals[key] = [character, xp_amount]
 
-    return character
-    pass
+    reports = {}
+    for key, (character, xp_amount) in totals.items():
+        try:
+            reports[key] = gain_experience(character, xp_amount)
+        except CharacterDeadError as e:
+            reports[key] = e
+    return [reports[id(character)] for character in characters]
+
+def _levels_gained(level, experience):
+    """
+    Number of level ups that experience pays for, starting at level
+    
+    Going from level L up k levels costs 100 * (L + (L+1) + ... + (L+k-1)),
+    which is 100 * (k*L + k*(k-1)/2). Solving k*k + (2L-1)*k <= 2*(experience // 100)
+    for the largest whole k gives the result with one integer square root.
+    """
+    if experience < level * 100:
+        return 0
+    b = 2 * level - 1
+    return (isqrt(b * b + 8 * (experience // 100)) - b) // 2
+
+def _apply_experience(character, experience):
+    """Set a character's experience total and apply every level up it pays for"""
+    old_level = character["level"]
+    levels = _levels_gained(old_level, experience)
+    # Experience left after paying 100 * (L + ... + (L+levels-1))
+    experience -= 100 * (levels * old_level + levels * (levels - 1) // 2)
+
+    character["experience"] = experience
+    report = {
+        "old_level": old_level,
+        "new_level": old_level + levels,
+        "levels_gained": levels,
+        "experience": experience,
+        "max_health": 10 * levels,
+        "strength": 2 * levels,
+        "magic": 2 * levels,
+    }
+    if levels:
+        character["level"] = old_level + levels
+        character["max_health"] += report["max_health"]
+        character["strength"] += report["strength"]
+        character["magic"] += report["magic"]
+        character["health"] = character["max_health"]
+    return report
 
 def add_gold(character, amount):
     """
@@ -264,6 +401,28 @@ def add_gold(character, amount):
     return total_gold
     pass
 
+def add_gold_bulk(characters, amounts):
+    """
+    Add gold to many characters in one call
+    
+    Args:
+        characters: List of character dictionaries
+        amounts: List of gold amounts, one per character
+    
+    A character may appear more than once. A grant that would leave a
+    character with negative gold is skipped and does not stop the batch.
+    
+    Returns: List with one entry per character, in order: the new gold
+             total, or the ValueError raised for it
+    """
+    results = []
+    for character, amount in zip(characters, amounts):
+        try:
+            results.append(add_gold(character, amount))
+        except ValueError as e:
+            results.append(e)
+    return results
+
 def heal_character(character, amount):
     """
     Heal character by specified amount
@@ -304,6 +463,1799 @@ def revive_character(character):
     return False
     pass
 
+# ============================================================================
+# QUEST STATE
+# ============================================================================
+
+class QuestList(list):
+    """
+    List of quest IDs with constant-time membership tests
+    
+    Used for a character's active_quests and completed_quests. It is a
+    real list, so it keeps insertion order, saves as a comma-separated
+    list and passes validate_character_data, but "quest_id in quests"
+    checks a count mirror instead of scanning the list.
+    
+    version increases on every change, so running aggregates kept in
+    stats (see quest_handler) can tell when the list was modified
+    behind their back.
+    """
+    __slots__ = ("_counts", "version", "stats")
+
+    def __init__(self, quest_ids=()):
+        list.__init__(self, quest_ids)
+        self.version = 0
+        self.stats = None
+        self._rebuild()
+
+    def _rebuild(self):
+        self.version += 1
+        self._counts = {}
+        for quest_id in self:
+            self._counts[quest_id] = self._counts.get(quest_id, 0) + 1
+
+    def _add(self, quest_id):
+        self.version += 1
+        self._counts[quest_id] = self._counts.get(quest_id, 0) + 1
+
+    def _drop(self, quest_id):
+        self.version += 1
+        if self._counts[quest_id] == 1:
+            del self._counts[quest_id]
+        else:
+            self._counts[quest_id] -= 1
+
+    def __contains__(self, quest_id):
+        return quest_id in self._counts
+
+    def distinct(self):
+        """Return the quest IDs without duplicates"""
+        return self._counts.keys()
+
+    def append(self, quest_id):
+        list.append(self, quest_id)
+        self._add(quest_id)
+
+    def extend(self, quest_ids):
+        quest_ids = list(quest_ids)
+        list.extend(self, quest_ids)
+        for quest_id in quest_ids:
+            self._add(quest_id)
+
+    def __iadd__(self, quest_ids):
+        self.extend(quest_ids)
+        return self
+
+    def insert(self, index, quest_id):
+        list.insert(self, index, quest_id)
+        self._add(quest_id)
+
+    def remove(self, quest_id):
+        list.remove(self, quest_id)
+        self._drop(quest_id)
+
+    def pop(self, index=-1):
+        quest_id = list.pop(self, index)
+        self._drop(quest_id)
+        return quest_id
+
+    def clear(self):
+        list.clear(self)
+        self._counts.clear()
+        self.version += 1
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self._rebuild()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._rebuild()
+
+    def copy(self):
+        return QuestList(self)
+
+    def __reduce__(self):
+        return (QuestList, (list(self),))
+
+def get_quest_list(character, key):
+    """
+    Get a character's active_quests or completed_quests as a QuestList
+    
+    A plain list (for example from a hand-built character dictionary) is
+    converted once and stored back, so later lookups are constant time.
+    A missing key is stored as an empty QuestList.
+    
+    Args:
+        character: Character dictionary
+        key: "active_quests" or "completed_quests"
+    
+    Returns: QuestList
+    """
+    quests = character.get(key)
+    if isinstance(quests, QuestList):
+        return quests
+    quests = QuestList(quests or [])
+    character[key] = quests
+    return quests
+
+# ============================================================================
+# INVENTORY STATE
+# ============================================================================
+
+class Inventory:
+    """
+    Inventory stored as an ordered {item_id: count} map
+
+    len(), "item_id in inventory", count(), append() and remove() are all
+    constant time; the total size is kept up to date rather than summed.
+    Iterating yields every item once per copy, grouped by item in the
+    order each item was first added, so ",".join(inventory) still gives
+    the comma-separated list written to save files, and indexing works
+    for menus that list the inventory with enumerate().
+
+    Two inventories (or an inventory and a list) are equal when they hold
+    the same items in the same quantities; order does not matter.
+    """
+    __slots__ = ("_counts", "_size")
+
+    def __init__(self, item_ids=()):
+        self._counts = {}
+        self._size = 0
+        self.extend(item_ids)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __iter__(self):
+        for item_id, count in self._counts.items():
+            for _ in range(count):
+                yield item_id
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("inventory index out of range")
+        for item_id, count in self._counts.items():
+            if index < count:
+                return item_id
+            index -= count
+
+    def count(self, item_id):
+        """Return how many copies of item_id are held"""
+        return self._counts.get(item_id, 0)
+
+    def items(self):
+        """Return (item_id, count) pairs in inventory order"""
+        return self._counts.items()
+
+    def append(self, item_id, quantity=1):
+        self._counts[item_id] = self._counts.get(item_id, 0) + quantity
+        self._size += quantity
+
+    def extend(self, item_ids):
+        for item_id in item_ids:
+            self.append(item_id)
+
+    def remove(self, item_id, quantity=1):
+        count = self._counts.get(item_id, 0)
+        if count < quantity:
+            raise ValueError(f"{item_id} not in inventory")
+        if count == quantity:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = count - quantity
+        self._size -= quantity
+
+    def clear(self):
+        self._counts.clear()
+        self._size = 0
+
+    def copy(self):
+        inventory = Inventory()
+        inventory._counts = dict(self._counts)
+        inventory._size = self._size
+        return inventory
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, list):
+            return self._size == len(other) and self._counts == Inventory(other)._counts
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Inventory({list(self)!r})"
+
+    def __reduce__(self):
+        return (Inventory, (list(self),))
+
+def get_inventory(character):
+    """
+    Get a character's inventory as an Inventory
+
+    A plain list is converted once and stored back, the same way
+    get_quest_list handles quest lists. A missing key is stored as an
+    empty Inventory.
+
+    Args:
+        character: Character dictionary
+
+    Returns: Inventory
+    """
+    inventory = character.get("inventory")
+    if isinstance(inventory, Inventory):
+        return inventory
+    inventory = Inventory(inventory or [])
+    character["inventory"] = inventory
+    return inventory
+
+# ============================================================================
+# CHANGE TRACKING
+# ============================================================================
+
+class TrackedCharacter(dict):
+    """
+    Character dictionary that remembers which fields changed
+    
+    Every assignment or deletion of a field adds it to dirty. Changes made
+    inside a field's list (inventory, quest lists) cannot be seen here, so
+    code that edits those lists in place calls mark_dirty.
+    
+    base is the save backend the character was last loaded from or saved
+    to, and dirty holds the fields changed since then. SaveStore uses the
+    pair to write only the changed fields.
+    
+    version is the save version this copy was loaded at or last saved
+    as through a CharacterSession (see CharacterSession.save).
+    """
+    __slots__ = ("dirty", "base", "version")
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.dirty = set()
+        self.base = None
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.dirty.add(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.dirty.add(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self.dirty.add(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self.dirty.add(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.dirty.add(key)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        changes = dict(*args, **kwargs)
+        dict.update(self, changes)
+        self.dirty.update(changes)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        self.dirty.update(self)
+        dict.clear(self)
+
+    def copy(self):
+        character = TrackedCharacter(self)
+        character.version = self.version
+        return character
+
+    def __reduce__(self):
+        return (TrackedCharacter, (dict(self),))
+
+def mark_dirty(character, *fields):
+    """
+    Record that fields of character changed in place
+    
+    Does nothing for a plain dictionary.
+    """
+    if isinstance(character, TrackedCharacter):
+        character.dirty.update(fields)
+
+def _mark_saved(character, base):
+    """Record that character now matches what base (or a save file) holds"""
+    if isinstance(character, TrackedCharacter):
+        character.dirty.clear()
+        character.base = base
+
+# ============================================================================
+# SAVE FILES
+# ============================================================================
+
+# One save file line per character field, in file order
+SAVE_LINES = {
+    "name": "Name: {name}\n",
+    "class": "Class: {class}\n",
+    "level": "Level: {level}\n",
+    "health": "Health: {health}\n",
+    "max_health": "Max_Health: {max_health}\n",
+    "strength": "Strength: {strength}\n",
+    "magic": "Magic: {magic}\n",
+    "experience": "Experience: {experience}\n",
+    "gold": "Gold: {gold}\n",
+    "inventory": "Inventory: {inventory}\n",
+    "active_quests": "Active_Quests: {active_quests}\n",
+    "completed_quests": "Completed_Quests: {completed_quests}\n",
+}
+SAVE_FORMAT = "".join(SAVE_LINES.values())
+
+def _save_text(value):
+    """Save file converter for a text field"""
+    return value.strip()
+
+def _save_inventory(value):
+    """Save file converter for a comma-separated inventory"""
+    value = value.strip()
+    return Inventory(value.split(",") if value else [])
+
+def _save_quest_list(value):
+    """Save file converter for a comma-separated quest list"""
+    value = value.strip()
+    return QuestList(value.split(",") if value else [])
+
+# Save file key -> (character field, converter from the raw value text).
+# int accepts the surrounding spaces itself.
+SAVE_FIELDS = {
+    "Name": ("name", _save_text),
+    "Class": ("class", _save_text),
+    "Level": ("level", int),
+    "Health": ("health", int),
+    "Max_Health": ("max_health", int),
+    "Strength": ("strength", int),
+    "Magic": ("magic", int),
+    "Experience": ("experience", int),
+    "Gold": ("gold", int),
+    "Inventory": ("inventory", _save_inventory),
+    "Active_Quests": ("active_quests", _save_quest_list),
+    "Completed_Quests": ("completed_quests", _save_quest_list),
+}
+
+# Binary save format (see _format_binary_save)
+BINARY_MAGIC = b"QCSAVE"
+BINARY_VERSION = 1
+BINARY_STAT_FIELDS = ["level", "health", "max_health", "strength", "magic", "experience", "gold"]
+BINARY_HEADER = struct.Struct("<6sB7q5I")
+BINARY_VERSION_OFFSET = len(BINARY_MAGIC)
+
+# Whether save_character writes the binary format (see set_binary_saves)
+_binary_saves = False
+
+# Index file that marks a save directory as sharded (see migrate_flat_saves)
+SAVE_INDEX = "saves.index"
+# Dead index lines tolerated before _read_index compacts the file
+INDEX_SLACK = 64
+
+_index_lock = threading.RLock()
+# Replayed index of each sharded directory: {index path: _IndexCheckpoint}
+_index_checkpoints = {}
+
+# Saves waiting for the end of a batched_saves() block, per thread:
+# {final path: (temporary path, callback to run after the rename)}
+_save_batch = threading.local()
+
+@contextmanager
+def batched_saves():
+    """
+    Sync every save made inside the block together at the end
+    
+    Saves inside the block are written to their temporary files without
+    a sync. When the block exits, each temporary file is synced (only
+    the batch's own files, not the whole disk), renamed over its save,
+    and each directory involved is synced once. Until then
+    load_character still sees the previous saves. Nested blocks join the
+    outer one.
+    
+    Example:
+        with batched_saves():
+            for character in party:
+                save_character(character)
+    """
+    if getattr(_save_batch, "pending", None) is not None:
+        yield
+        return
+
+    _save_batch.pending = {}
+    try:
+        yield
+    except BaseException:
+        pending = _save_batch.pending
+        _save_batch.pending = None
+        for temp_name, on_replace in pending.values():
+            _remove_quietly(temp_name)
+        raise
+
+    pending = _save_batch.pending
+    _save_batch.pending = None
+    if not pending:
+        return
+    sync_data = getattr(os, "fdatasync", os.fsync)
+    for temp_name, on_replace in pending.values():
+        with open(temp_name, "rb") as file:
+            sync_data(file.fileno())
+    for file_name, (temp_name, on_replace) in pending.items():
+        os.replace(temp_name, file_name)
+        if on_replace is not None:
+            on_replace()
+    for directory in {os.path.dirname(file_name) for file_name in pending}:
+        _sync_directory(directory)
+
+def migrate_flat_saves(save_directory="data/save_games"):
+    """
+    Convert a flat save directory to the sharded layout
+    
+    Sharded directories keep each save in a subdirectory named after the
+    first two hex digits of a hash of the character name, and list their
+    characters in an append-only index file (SAVE_INDEX). Running this on
+    an empty or missing directory sets it up as sharded.
+    
+    The index is written first, so a migration that is interrupted can
+    simply be run again: saves not moved yet are still found at their old
+    flat path. A flat save whose character has since been saved into its
+    shard is out of date and is deleted instead of moved.
+    
+    Returns: Number of saves moved into shards
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    flat_names = [f[:-len("_save.txt")] for f in os.listdir(save_directory)
+                  if f.endswith("_save.txt")]
+
+    with _index_lock:
+        names = _read_index(save_directory) if _is_sharded(save_directory) else []
+        known = set(names)
+        names.extend(name for name in flat_names if name not in known)
+        _write_index(save_directory, names)
+
+    moved = 0
+    for name in flat_names:
+        flat_name = os.path.join(save_directory, f"{name}_save.txt")
+        shard_name = _save_path(name, save_directory, True)
+        if os.path.exists(shard_name):
+            _remove_quietly(flat_name)
+            continue
+        os.makedirs(os.path.dirname(shard_name), exist_ok=True)
+        os.replace(flat_name, shard_name)
+        moved += 1
+    _sync_directory(save_directory)
+    return moved
+
+def _is_sharded(save_directory):
+    """A save directory is sharded once it has an index file"""
+    return os.path.exists(_index_path(save_directory))
+
+def _index_path(save_directory):
+    """Path of the index file of a sharded save directory"""
+    return os.path.join(save_directory, SAVE_INDEX)
+
+def _save_path(character_name, save_directory, sharded):
+    """Path a character's save is written to"""
+    file_name = f"{character_name}_save.txt"
+    if not sharded:
+        return os.path.join(save_directory, file_name)
+    shard = hashlib.md5(character_name.encode("utf-8")).hexdigest()[:2]
+    return os.path.join(save_directory, shard, file_name)
+
+def _read_save(character_name, save_directory, sharded):
+    """
+    Read the bytes of a character's save file
+    
+    Opens the file straight away rather than checking that it exists
+    first. Sharded directories fall back to the flat path for saves that
+    a migration has not moved yet.
+    
+    Raises:
+        CharacterNotFoundError if there is no save file
+        SaveFileCorruptedError if it can't be read
+    """
+    paths = [_save_path(character_name, save_directory, sharded)]
+    if sharded:
+        paths.append(_save_path(character_name, save_directory, False))
+    for file_name in paths:
+        try:
+            with open(file_name, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            continue
+        except (PermissionError, IOError):
+            raise SaveFileCorruptedError(f"Could not read file for {character_name}")
+    raise CharacterNotFoundError(f"No save file found for {character_name}")
+
+def _find_save(character_name, save_directory):
+    """
+    Path of an existing save, or None
+    
+    Sharded directories fall back to the flat path for saves that a
+    migration has not moved yet.
+    """
+    sharded = _is_sharded(save_directory)
+    file_name = _save_path(character_name, save_directory, sharded)
+    if os.path.exists(file_name):
+        return file_name
+    if sharded:
+        file_name = _save_path(character_name, save_directory, False)
+        if os.path.exists(file_name):
+            return file_name
+    return None
+
+def _added_to_shard(save_directory, character_name):
+    """
+    Index a save written to its shard for the first time
+    
+    A flat copy left behind by an interrupted migration is older than
+    the shard file now, so it is deleted.
+    """
+    _append_index(save_directory, "+", character_name)
+    _remove_quietly(_save_path(character_name, save_directory, False))
+
+def _append_index(save_directory, op, character_name):
+    """Record an added (+) or deleted (-) character in the index"""
+    with _index_lock:
+        with open(_index_path(save_directory), "a", encoding="utf-8") as file:
+            file.write(f"{op}{character_name}\n")
+
+def _write_index(save_directory, names):
+    """Rewrite the index with one added entry per name"""
+    path = _index_path(save_directory)
+    with _index_lock:
+        text = "".join(f"+{name}\n" for name in names)
+        _write_atomic(path, text, batch=False)
+        checkpoint = _IndexCheckpoint(os.stat(path))
+        checkpoint.replay(text)
+        _index_checkpoints[path] = checkpoint
+
+def _read_index(save_directory, offset=0, limit=None):
+    """
+    Names in a sharded directory's index, in save order
+    
+    The replayed index is kept in memory with the byte offset it was read
+    up to (see _IndexCheckpoint), so a read only replays the entries
+    appended since, usually none, and a page is sliced from the kept
+    list. When deleted entries make up most of the index it is rewritten
+    with only the live names.
+    
+    Args:
+        save_directory: Sharded save directory
+        offset: Number of names to skip
+        limit: Largest number of names to return (None for all)
+    
+    Returns: List of character names
+    """
+    path = _index_path(save_directory)
+    with _index_lock:
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            checkpoint = _index_checkpoints.get(path)
+            if checkpoint is None or not checkpoint.matches(stat):
+                checkpoint = _IndexCheckpoint(stat)
+                checkpoint.end = 0
+                _index_checkpoints[path] = checkpoint
+            if stat.st_size > checkpoint.end:
+                file.seek(checkpoint.end)
+                data = file.read()
+                # A line still being appended is replayed on a later read
+                complete = data.rfind(b"\n") + 1
+                checkpoint.replay(data[:complete].decode("utf-8"))
+                checkpoint.end += complete
+
+        if checkpoint.records > 2 * len(checkpoint.names) + INDEX_SLACK:
+            _write_index(save_directory, checkpoint.names)
+        end = None if limit is None else offset + limit
+        return checkpoint.names[offset:end]
+
+class _IndexCheckpoint:
+    """
+    Index state replayed up to byte offset end of one index file
+    
+    names lists the live names in save order. Adding a name is constant
+    time; a deleted entry removes its name from the list, which is
+    linear but rare next to listing.
+    """
+    __slots__ = ("file_id", "end", "names", "live", "records")
+
+    def __init__(self, stat):
+        self.file_id = (stat.st_dev, stat.st_ino)
+        self.end = stat.st_size
+        self.names = []
+        self.live = set()
+        self.records = 0
+
+    def matches(self, stat):
+        """True if stat is the same index file, not shorter than what was replayed"""
+        return (stat.st_dev, stat.st_ino) == self.file_id and stat.st_size >= self.end
+
+    def replay(self, text):
+        """Apply whole index lines"""
+        for line in text.splitlines():
+            self.records += 1
+            name = line[1:]
+            if line[:1] == "+":
+                if name not in self.live:
+                    self.live.add(name)
+                    self.names.append(name)
+            elif line[:1] == "-":
+                if name in self.live:
+                    self.live.remove(name)
+                    self.names.remove(name)
+
+def _parse_save(data):
+    """
+    Build a character dictionary from the bytes of a save file
+    
+    The file is decoded once and each line is looked up in SAVE_FIELDS
+    and converted in one pass.
+    
+    Binary saves (see _format_binary_save) are recognised by their magic
+    bytes and parsed by _parse_binary_save.
+    
+    Raises: InvalidSaveDataError if data format is wrong
+    """
+    if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return _parse_binary_save(data)
+    values = {}
+    try:
+        for line in data.decode("utf-8").splitlines():
+            key, sep, value = line.partition(":")
+            if not sep:
+                raise ValueError(line)
+            entry = SAVE_FIELDS.get(key) or SAVE_FIELDS.get(key.strip())
+            if entry is None:
+                raise InvalidSaveDataError(f"Wrong field {key.strip()} in save file.")
+            field, convert = entry
+            values[field] = convert(value)
+        
+        if len(values) != len(SAVE_FIELDS):
+            for field, convert in SAVE_FIELDS.values():
+                if field not in values:
+                    raise InvalidSaveDataError(f"Missing {field} in save file")
+
+    except ValueError:
+        raise InvalidSaveDataError("Save file format is invalid")
+    
+    return TrackedCharacter(values)
+
+def set_binary_saves(enabled):
+    """
+    Choose the format save_character writes save files in
+    
+    Args:
+        enabled: True for the binary save format, False for text
+    
+    Save files keep their {name}_save.txt name in both formats, and
+    load_character reads either. convert_saves rewrites existing files.
+    
+    Returns: The previous setting
+    """
+    global _binary_saves
+    previous = _binary_saves
+    _binary_saves = bool(enabled)
+    return previous
+
+def convert_saves(save_directory="data/save_games", binary=True):
+    """
+    Rewrite every save file in a directory in the binary or text format
+    
+    Files already in the requested format are left alone. All rewrites
+    share one disk sync (see batched_saves).
+    
+    Returns: Number of save files converted
+    """
+    if not os.path.exists(save_directory):
+        return 0
+    if _is_sharded(save_directory):
+        names = _read_index(save_directory)
+    else:
+        names = [f[:-len("_save.txt")] for f in os.listdir(save_directory)
+                 if f.endswith("_save.txt")]
+
+    converted = 0
+    with batched_saves():
+        for name in names:
+            file_name = _find_save(name, save_directory)
+            if file_name is None:
+                continue
+            with open(file_name, "rb") as file:
+                data = file.read()
+            if (data[:len(BINARY_MAGIC)] == BINARY_MAGIC) == binary:
+                continue
+            character = _parse_save(data)
+            _write_atomic(file_name, _format_binary_save(character) if binary else _format_save(character))
+            converted += 1
+    return converted
+
+def _format_binary_save(character):
+    """
+    Build a save file in the binary save format
+    
+    Layout (little-endian):
+        BINARY_HEADER   magic, format version, the seven numeric fields in
+                        BINARY_STAT_FIELDS order, then the byte lengths of
+                        the five string fields in BINARY_STRING_FIELDS order
+        strings         the five string fields as UTF-8; the three lists
+                        (inventory and quests) are string tables with their
+                        entries separated by NUL bytes
+    
+    The whole fixed part is read with one unpack, and each list with one
+    decode and split.
+    """
+    strings = [
+        character["name"].encode("utf-8"),
+        character["class"].encode("utf-8"),
+        "\0".join(character["inventory"]).encode("utf-8"),
+        "\0".join(character["active_quests"]).encode("utf-8"),
+        "\0".join(character["completed_quests"]).encode("utf-8"),
+    ]
+    try:
+        header = BINARY_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION,
+            *[character[field] for field in BINARY_STAT_FIELDS],
+            *[len(value) for value in strings]
+        )
+    except struct.error as e:
+        raise InvalidSaveDataError(f"Character can not be saved in the binary format: {e}")
+    return header + b"".join(strings)
+
+def _parse_binary_save(data):
+    """
+    Build a character dictionary from a binary save file
+    
+    Raises: InvalidSaveDataError if the data is cut short or has an
+            unknown format version
+    """
+    try:
+        if data[BINARY_VERSION_OFFSET] != BINARY_VERSION:
+            raise InvalidSaveDataError(f"Unknown save format version {data[BINARY_VERSION_OFFSET]}")
+        header = BINARY_HEADER.unpack_from(data, 0)
+        lengths = header[-5:]
+        if BINARY_HEADER.size + sum(lengths) != len(data):
+            raise InvalidSaveDataError("Save file format is invalid")
+
+        values = dict(zip(BINARY_STAT_FIELDS, header[2:9]))
+        offset = BINARY_HEADER.size
+        strings = []
+        for length in lengths:
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        values["name"], values["class"], inventory, active, completed = strings
+        values["inventory"] = Inventory(inventory.split("\0") if inventory else [])
+        values["active_quests"] = QuestList(active.split("\0") if active else [])
+        values["completed_quests"] = QuestList(completed.split("\0") if completed else [])
+    except (struct.error, IndexError, ValueError):
+        raise InvalidSaveDataError("Save file format is invalid")
+    return TrackedCharacter(values)
+
+def _format_save(character, fields=None):
+    """
+    Build the whole save file as one string
+    
+    With fields, only the lines for those fields are built, in file order.
+    """
+    template = SAVE_FORMAT
+    if fields is not None:
+        template = "".join(line for field, line in SAVE_LINES.items() if field in fields)
+    values = dict(character)
+    for key in ("inventory", "active_quests", "completed_quests"):
+        values[key] = ",".join(character[key])
+    return template.format_map(values)
+
+def _write_atomic(file_name, text, on_replace=None, batch=True):
+    """
+    Replace file_name with text (str or bytes) without ever leaving a partial file
+    
+    The file keeps the permissions of the file it replaces, and a new file
+    gets the ones open() would give it. on_replace, if given, is called
+    once the new file is in place. Inside
+    batched_saves() the sync and rename are left to the batch unless
+    batch is False.
+    """
+    directory = os.path.dirname(file_name) or "."
+    fd, temp_name = _create_temp_file(file_name)
+    pending = getattr(_save_batch, "pending", None) if batch else None
+    try:
+        with os.fdopen(fd, "wb") as file:
+            _copy_file_mode(file_name, temp_name)
+            file.write(text.encode("utf-8") if isinstance(text, str) else text)
+            if pending is None:
+                file.flush()
+                os.fsync(file.fileno())
+        if pending is None:
+            os.replace(temp_name, file_name)
+            _sync_directory(directory)
+        else:
+            older = pending.pop(file_name, None)
+            if older is not None:
+                _remove_quietly(older[0])
+                on_replace = on_replace or older[1]
+            pending[file_name] = (temp_name, on_replace)
+            return
+    except BaseException:
+        _remove_quietly(temp_name)
+        raise
+    if on_replace is not None:
+        on_replace()
+
+def _create_temp_file(file_name):
+    """
+    Create a new, uniquely named temporary file next to file_name
+    
+    The file is created the way open() creates files, so the kernel
+    applies the current umask to its permissions.
+    
+    Returns: Tuple of (file descriptor, temporary path)
+    """
+    directory = os.path.dirname(file_name) or "."
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_name = os.path.join(
+            directory, f".{os.path.basename(file_name)}.{os.urandom(6).hex()}.tmp"
+        )
+        try:
+            return os.open(temp_name, flags, 0o666), temp_name
+        except FileExistsError:
+            continue
+
+def _copy_file_mode(file_name, temp_name):
+    """Give temp_name the permissions of file_name, if it already exists"""
+    try:
+        mode = os.stat(file_name).st_mode & 0o7777
+    except FileNotFoundError:
+        return
+    os.chmod(temp_name, mode)
+
+def _sync_directory(directory):
+    """Make a rename in directory durable where the platform allows it"""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _remove_quietly(file_name):
+    """Delete a leftover file, ignoring errors"""
+    try:
+        os.remove(file_name)
+    except OSError:
+        pass
+
+# ============================================================================
+# SAVE STORE
+# ============================================================================
+
+# Backend that save/load/list/delete route through instead of save files
+_save_backend = None
+
+# Save store log layout: file magic, then records of
+# CRC-32 + (operation b"+", b"-" or b"d", name length, data length) + name + data,
+# the CRC covering everything in the record after it
+STORE_MAGIC = b"QCSTORE1"
+STORE_CRC = struct.Struct("<I")
+STORE_HEADER = struct.Struct("<cHI")
+STORE_RECORD_START = STORE_CRC.size + STORE_HEADER.size
+# Dead bytes tolerated before a SaveStore compacts itself
+STORE_COMPACT_MIN = 1 << 20
+# Delta records written before a SaveStore writes a full save again
+STORE_CHECKPOINT_EVERY = 32
+
+def set_save_backend(backend):
+    """
+    Route save_character, load_character, list_saved_characters and
+    delete_character through a save backend
+    
+    Args:
+        backend: Object with save(character), load(name), names() and
+                 delete(name) methods, such as a SaveStore, or None to go
+                 back to one save file per character
+    
+    Returns: The previously configured backend
+    """
+    global _save_backend
+    previous = _save_backend
+    _save_backend = backend
+    return previous
+
+class SaveStore:
+    """
+    Every character save in one append-only log file
+    
+    Each record is a CRC-32 of the rest of the record, a header
+    (STORE_HEADER: operation, name length, data length), then the name
+    and the save text in the usual save file format. A save appends a "+" record and a delete appends a "-" record,
+    so saving or deleting is one write to an already open file. An
+    in-memory index maps each name to the offsets of its latest save,
+    which is read back through an mmap of the log.
+    
+    A TrackedCharacter that was last loaded from or saved to this store
+    only writes the fields changed since then, as a "d" (delta) record
+    holding just those save lines. Loading replays the deltas over the
+    last full save. Every STORE_CHECKPOINT_EVERY deltas a full save is
+    written instead, so a load never replays a long chain.
+    
+    Old records stay in the log until compact() rewrites it with one full
+    record per character. This happens on its own once dead records take
+    up more space than live ones.
+    
+    A record cut short by a crash is detected when the log is opened and
+    trimmed off, which leaves the previous save of that character. Only
+    the last record can be cut short this way, so a record that fails its
+    CRC is trimmed only when no valid record follows it anywhere in the
+    file; otherwise SaveFileCorruptedError is raised and the file is left
+    as it is.
+    
+    Example:
+        store = SaveStore("data/save_games/saves.store")
+        set_save_backend(store)
+    """
+
+    def __init__(self, path, sync=True):
+        """
+        Open or create the log at path
+        
+        Args:
+            path: Log file path
+            sync: fsync after every save and delete
+        """
+        self.path = path
+        self.sync = sync
+        self._lock = threading.RLock()
+        self._file = None
+        self._map = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        """Open the log and rebuild the index from its records"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as file:
+                file.write(STORE_MAGIC)
+        self._file = open(self.path, "r+b")
+        self._map = None
+        # {name: [(data offset, data length, record length), ...]}
+        # holding the last full save followed by its deltas
+        self._index = {}
+        self.live_bytes = 0
+        self.dead_bytes = 0
+
+        self._remap()
+        data = self._map
+        if data[:len(STORE_MAGIC)] != STORE_MAGIC:
+            self.close()
+            raise SaveFileCorruptedError(f"{self.path} is not a save store")
+        offset = len(STORE_MAGIC)
+        end = len(data)
+        while offset < end:
+            record = _read_store_record(data, offset, end)
+            if record is None:
+                if any(_read_store_record(data, position, end) is not None
+                       for position in range(offset + 1, end - STORE_RECORD_START + 1)):
+                    self.close()
+                    raise SaveFileCorruptedError(f"{self.path} is damaged at byte {offset}")
+                # Torn record from a crash mid-append: nothing valid follows it
+                self._map.close()
+                self._map = None
+                self._file.truncate(offset)
+                break
+            op, name, data_offset, data_length, record_end = record
+            self._apply(op, name, data_offset, data_length, record_end - offset)
+            offset = record_end
+        self._file.seek(offset)
+
+    def _apply(self, op, name, data_offset, data_length, record_length):
+        """Update the index for one record"""
+        entry = (data_offset, data_length, record_length)
+        if op == b"d" and name in self._index:
+            self._index[name].append(entry)
+            self.live_bytes += record_length
+            return
+
+        old = self._index.pop(name, None)
+        if old is not None:
+            old_length = sum(record[2] for record in old)
+            self.live_bytes -= old_length
+            self.dead_bytes += old_length
+        if op == b"+":
+            self._index[name] = [entry]
+            self.live_bytes += record_length
+        else:
+            self.dead_bytes += record_length
+
+    def _append(self, op, name, text=""):
+        """Append one record and update the index"""
+        name_bytes = name.encode("utf-8")
+        data = text.encode("utf-8")
+        record = _store_record(op, name_bytes, data)
+        offset = self._file.tell()
+        self._file.write(record)
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        self._apply(op, name, offset + STORE_RECORD_START + len(name_bytes), len(data), len(record))
+        if self.dead_bytes > max(STORE_COMPACT_MIN, self.live_bytes):
+            self.compact()
+
+    def save(self, character):
+        """
+        Append a save of character
+        
+        Only the changed fields are written when character is a
+        TrackedCharacter last synced with this store, and nothing at all
+        when none changed.
+        """
+        name = character["name"]
+        with self._lock:
+            chain = self._index.get(name)
+            if (chain is not None and isinstance(character, TrackedCharacter)
+                    and character.base is self and "name" not in character.dirty
+                    and len(chain) <= STORE_CHECKPOINT_EVERY):
+                changed = character.dirty.intersection(SAVE_LINES)
+                if changed:
+                    self._append(b"d", name, _format_save(character, changed))
+            else:
+                self._append(b"+", name, _format_save(character))
+            _mark_saved(character, self)
+
+    def load(self, character_name):
+        """
+        Read back the latest save of a character
+        
+        Raises: CharacterNotFoundError if it has no save
+        """
+        with self._lock:
+            if character_name not in self._index:
+                raise CharacterNotFoundError(f"No save file found for {character_name}")
+            character = _parse_save(self._merged_save(character_name))
+            _mark_saved(character, self)
+        return character
+
+    def _merged_save(self, character_name):
+        """Save file bytes of a character with its deltas applied"""
+        chain = self._index[character_name]
+        offset, length, record_length = chain[-1]
+        if self._map is None or offset + length > len(self._map):
+            self._remap()
+        if len(chain) == 1:
+            return self._map[offset:offset + length]
+        lines = {}
+        for offset, length, record_length in chain:
+            for line in self._map[offset:offset + length].splitlines():
+                lines[line.partition(b":")[0]] = line
+        return b"\n".join(lines.values()) + b"\n"
+
+    def names(self):
+        """Names of every saved character, oldest save first"""
+        with self._lock:
+            return list(self._index)
+
+    def delete(self, character_name):
+        """
+        Delete a character's save
+        
+        Returns: True if deleted
+        Raises: CharacterNotFoundError if it has no save
+        """
+        with self._lock:
+            if character_name not in self._index:
+                raise CharacterNotFoundError(f"No save file found for {character_name}")
+            self._append(b"-", character_name)
+            return True
+
+    def __contains__(self, character_name):
+        return character_name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def compact(self):
+        """Rewrite the log with one full save per character"""
+        with self._lock:
+            self._remap()
+            directory = os.path.dirname(self.path) or "."
+            fd, temp_name = _create_temp_file(self.path)
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    _copy_file_mode(self.path, temp_name)
+                    file.write(STORE_MAGIC)
+                    for name, chain in self._index.items():
+                        if len(chain) == 1:
+                            offset, length, record_length = chain[0]
+                            file.write(self._map[offset + length - record_length:offset + length])
+                            continue
+                        name_bytes = name.encode("utf-8")
+                        data = self._merged_save(name)
+                        file.write(_store_record(b"+", name_bytes, data))
+                    file.flush()
+                    os.fsync(file.fileno())
+                self.close()
+                try:
+                    os.replace(temp_name, self.path)
+                finally:
+                    self._open()
+            except BaseException:
+                _remove_quietly(temp_name)
+                raise
+            _sync_directory(directory)
+
+    def _remap(self):
+        """Map the whole log, including records appended since the last map"""
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Close the log file"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _store_record(op, name_bytes, data):
+    """Build one save store record: CRC, header, name and data"""
+    body = STORE_HEADER.pack(op, len(name_bytes), len(data)) + name_bytes + data
+    return STORE_CRC.pack(zlib.crc32(body)) + body
+
+def _read_store_record(data, offset, end):
+    """
+    Read the save store record starting at offset
+    
+    Returns: Tuple of (operation, name, data offset, data length, record end),
+             or None if there is no whole record with a matching CRC there
+    """
+    if offset + STORE_RECORD_START > end:
+        return None
+    (crc,) = STORE_CRC.unpack_from(data, offset)
+    op, name_length, data_length = STORE_HEADER.unpack_from(data, offset + STORE_CRC.size)
+    start = offset + STORE_RECORD_START
+    record_end = start + name_length + data_length
+    if op not in (b"+", b"-", b"d") or record_end > end:
+        return None
+    if zlib.crc32(data[offset + STORE_CRC.size:record_end]) != crc:
+        return None
+    try:
+        name = data[start:start + name_length].decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    return op, name, start + name_length, data_length, record_end
+
+# ============================================================================
+# SQLITE STORE
+# ============================================================================
+
+# Columns of the characters table, in the order validate_character_data
+# checks them. The three list fields are stored comma-separated, as in a
+# save file.
+SQLITE_COLUMNS = [
+    "name", "class", "level", "health", "max_health", "strength", "magic",
+    "experience", "gold", "inventory", "active_quests", "completed_quests"
+]
+SQLITE_LIST_COLUMNS = ["inventory", "active_quests", "completed_quests"]
+# Names per query in SQLiteSaveStore.load_many, under SQLite's parameter limit
+SQLITE_BATCH = 500
+
+class SQLiteSaveStore:
+    """
+    Character saves as rows of a local SQLite database
+    
+    Each character is one row of the characters table with a column per
+    field, so queries such as characters_above_level run in SQLite
+    without reading every save. The database uses WAL mode, and saves are
+    upserts, so save_many writes a whole list in one transaction.
+    
+    It has the same methods as SaveStore and can be passed to
+    set_save_backend.
+    
+    Example:
+        store = SQLiteSaveStore("data/save_games/saves.db")
+        set_save_backend(store)
+    """
+
+    def __init__(self, path):
+        """Open or create the database at path"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(
+            f"{column} TEXT NOT NULL" if column in SQLITE_LIST_COLUMNS or column == "class"
+            else f"{column} INTEGER NOT NULL"
+            for column in SQLITE_COLUMNS[1:]
+        )
+        with self._db:
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS characters (name TEXT PRIMARY KEY, {columns})")
+            self._db.execute("CREATE INDEX IF NOT EXISTS characters_level ON characters (level)")
+
+        placeholders = ", ".join("?" for column in SQLITE_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in SQLITE_COLUMNS[1:])
+        self._upsert = (f"INSERT INTO characters ({', '.join(SQLITE_COLUMNS)}) VALUES ({placeholders}) "
+                        f"ON CONFLICT (name) DO UPDATE SET {updates}")
+        self._select = f"SELECT {', '.join(SQLITE_COLUMNS)} FROM characters"
+
+    def save(self, character):
+        """Insert or update one character"""
+        self.save_many([character])
+
+    def save_many(self, characters):
+        """Insert or update every character in one transaction"""
+        rows = [_character_row(character) for character in characters]
+        with self._lock, self._db:
+            self._db.executemany(self._upsert, rows)
+        for character in characters:
+            _mark_saved(character, None)
+
+    def load(self, character_name):
+        """
+        Read back a saved character
+        
+        Raises: CharacterNotFoundError if it has no save
+        """
+        with self._lock:
+            row = self._db.execute(f"{self._select} WHERE name = ?", (character_name,)).fetchone()
+        if row is None:
+            raise CharacterNotFoundError(f"No save file found for {character_name}")
+        return _row_character(row)
+
+    def load_many(self, character_names):
+        """
+        Read back many saved characters with a few queries
+        
+        Returns: Dictionary {name: character dictionary, or the
+                 CharacterNotFoundError raised for it}
+        """
+        names = list(character_names)
+        found = {}
+        with self._lock:
+            for start in range(0, len(names), SQLITE_BATCH):
+                batch = names[start:start + SQLITE_BATCH]
+                placeholders = ", ".join("?" for name in batch)
+                for row in self._db.execute(f"{self._select} WHERE name IN ({placeholders})", batch):
+                    found[row[0]] = _row_character(row)
+        return {
+            name: found[name] if name in found
+            else CharacterNotFoundError(f"No save file found for {name}")
+            for name in names
+        }
+
+    def names(self):
+        """Names of every saved character, oldest save first"""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT name FROM characters ORDER BY rowid")]
+
+    def delete(self, character_name):
+        """
+        Delete a character's save
+        
+        Returns: True if deleted
+        Raises: CharacterNotFoundError if it has no save
+        """
+        with self._lock, self._db:
+            deleted = self._db.execute("DELETE FROM characters WHERE name = ?", (character_name,)).rowcount
+        if not deleted:
+            raise CharacterNotFoundError(f"No save file found for {character_name}")
+        return True
+
+    def characters_above_level(self, level):
+        """
+        Load every character whose level is above level
+        
+        Uses the level index, so only matching rows are read.
+        
+        Returns: List of character dictionaries, highest level first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                f"{self._select} WHERE level > ? ORDER BY level DESC, name", (level,)
+            ).fetchall()
+        return [_row_character(row) for row in rows]
+
+    def __contains__(self, character_name):
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM characters WHERE name = ?", (character_name,)
+            ).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _character_row(character):
+    """Turn a character dictionary into a characters table row"""
+    validate_character_data(character)
+    return tuple(
+        ",".join(character[column]) if column in SQLITE_LIST_COLUMNS else character[column]
+        for column in SQLITE_COLUMNS
+    )
+
+def _row_character(row):
+    """Turn a characters table row back into a character dictionary"""
+    character = TrackedCharacter(zip(SQLITE_COLUMNS, row))
+    inventory = character["inventory"]
+    character["inventory"] = Inventory(inventory.split(",") if inventory else [])
+    for key in ("active_quests", "completed_quests"):
+        quests = character[key]
+        character[key] = QuestList(quests.split(",") if quests else [])
+    _mark_saved(character, None)
+    return character
+
+# ============================================================================
+# SAVE QUEUE
+# ============================================================================
+
+class SaveQueue:
+    """
+    Write-behind queue that saves characters on a background thread
+    
+    put() takes a snapshot of the character and returns at once; a worker
+    thread saves the snapshots in the order they were queued. A character
+    that is queued again before its save starts replaces the waiting
+    snapshot in its place in the queue, so only its latest state is
+    written and frequent saves of one character do not hold it back. At most max_pending
+    characters wait at a time; put() blocks when the queue is full.
+    
+    A failed save is passed to on_error(character_name, error), or kept
+    in errors when there is no callback or the callback itself fails, and the fields it would have
+    written are added to the character's next queued save, or marked
+    dirty again on the character when none is queued.
+    
+    Example:
+        queue = SaveQueue(on_error=report)
+        queue.put(character)
+        ...
+        queue.drain()
+    """
+
+    def __init__(self, save=None, max_pending=1000, on_error=None):
+        """
+        Start the worker thread
+        
+        Args:
+            save: Function called with each character snapshot
+                  (save_character by default)
+            max_pending: Largest number of characters waiting to be saved
+            on_error: Called with (character_name, error) when a save fails
+        """
+        self.save = save or save_character
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.errors = []
+        # {character name: (snapshot, character it was taken from)}
+        self._pending = OrderedDict()
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="SaveQueue", daemon=True)
+        self._thread.start()
+
+    def put(self, character, timeout=None):
+        """
+        Queue a save of character's current state
+        
+        Returns: True if queued, False if the queue stayed full for timeout seconds
+        Raises: RuntimeError if the queue has been drained
+        """
+        name = character["name"]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SaveQueue has been drained")
+            if name not in self._pending:
+                if not self._condition.wait_for(
+                        lambda: len(self._pending) < self.max_pending or self._closed, timeout):
+                    return False
+                if self._closed:
+                    raise RuntimeError("SaveQueue has been drained")
+            snapshot = _snapshot_character(character)
+            older = self._pending.get(name)
+            if older is not None and isinstance(snapshot, TrackedCharacter):
+                snapshot.dirty.update(older[0].dirty)
+            # Replacing the value keeps the character's place in the queue
+            self._pending[name] = (snapshot, character)
+            self._condition.notify_all()
+        return True
+
+    def __len__(self):
+        with self._condition:
+            return len(self._pending) + self._busy
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued save has been written
+        
+        Returns: True if the queue emptied, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def drain(self, timeout=None):
+        """
+        Write every queued save, then stop the worker thread
+        
+        Used at shutdown. put() raises afterwards.
+        
+        Returns: True if every save was written before timeout
+        """
+        done = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return done
+
+    def _run(self):
+        """Worker thread: save queued snapshots until drained"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                name, (snapshot, character) = self._pending.popitem(last=False)
+                self._busy = True
+                self._condition.notify_all()
+            try:
+                self.save(snapshot)
+                if isinstance(snapshot, TrackedCharacter):
+                    # Later changes are tracked relative to what was just written
+                    character.base = snapshot.base
+            except Exception as e:
+                if isinstance(snapshot, TrackedCharacter):
+                    self._restore_dirty(name, snapshot, character)
+                self._report(name, e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _report(self, name, error):
+        """
+        Pass a failed save to on_error, or keep it in errors
+        
+        A callback that raises must not stop the worker thread, so the
+        save error is then kept in errors as if there were no callback.
+        """
+        if self.on_error is not None:
+            try:
+                self.on_error(name, error)
+                return
+            except Exception:
+                pass
+        self.errors.append((name, error))
+
+    def _restore_dirty(self, name, snapshot, character):
+        """
+        Keep the fields of a failed save waiting to be written
+        
+        A newer snapshot of the character that is already queued gets
+        them, since it will be saved next and may be a delta save; with
+        none queued they are marked dirty on the character again.
+        """
+        with self._condition:
+            pending = self._pending.get(name)
+            if pending is not None and isinstance(pending[0], TrackedCharacter):
+                pending[0].dirty.update(snapshot.dirty)
+            else:
+                mark_dirty(character, *snapshot.dirty)
+
+def _snapshot_character(character):
+    """
+    Copy a character so later changes do not reach a queued save
+    
+    The dirty fields move to the copy, and the character starts tracking
+    again from a clean slate.
+    """
+    snapshot = _copy_character(character)
+    if isinstance(character, TrackedCharacter):
+        character.dirty.clear()
+    return snapshot
+
+def _copy_character(character):
+    """Copy a character and its lists, keeping its dirty fields, base and version"""
+    copy = TrackedCharacter()
+    for key, value in character.items():
+        if isinstance(value, QuestList):
+            value = QuestList(value)
+        elif isinstance(value, Inventory):
+            value = value.copy()
+        elif isinstance(value, list):
+            value = list(value)
+        dict.__setitem__(copy, key, value)
+    if isinstance(character, TrackedCharacter):
+        copy.dirty = set(character.dirty)
+        copy.base = character.base
+        copy.version = character.version
+    else:
+        copy = dict(copy)
+    return copy
+
+# ============================================================================
+# CHARACTER SESSIONS
+# ============================================================================
+
+# Number of locks shared by all characters (see CharacterSession)
+LOCK_STRIPES = 64
+_character_locks = [threading.RLock() for i in range(LOCK_STRIPES)]
+
+# Save version of each character saved through a CharacterSession:
+# {(save location, name): version}
+_save_versions = {}
+_save_versions_lock = threading.Lock()
+
+class CharacterSession:
+    """
+    Exclusive access to one or more characters for a block of code
+    
+    Entering the session takes the lock of every character in it, so two
+    threads working on the same character (for example purchase_item and
+    complete_quest) run one after the other, while work on other
+    characters carries on in parallel. Locks are striped: each name maps
+    to one of LOCK_STRIPES shared locks, so memory does not grow with the
+    number of characters, at the cost of two characters occasionally
+    sharing a lock. A session over several characters takes their locks
+    in a fixed order, so two sessions can not deadlock each other.
+    
+    save() checks the save version before writing: if the character was
+    saved through another session since this copy was loaded, it raises
+    CharacterVersionConflictError instead of overwriting those changes.
+    
+    Example:
+        with CharacterSession(character) as session:
+            inventory_system.purchase_item(character, item_id, item)
+            session.save()
+    """
+
+    def __init__(self, *characters, save_directory="data/save_games"):
+        """
+        Args:
+            characters: Character dictionaries to lock
+            save_directory: Directory save() writes to
+        """
+        self.characters = characters
+        self.save_directory = save_directory
+        stripes = {_lock_stripe(character["name"]) for character in characters}
+        self._locks = [_character_locks[stripe] for stripe in sorted(stripes)]
+
+    def __enter__(self):
+        for lock in self._locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def save(self):
+        """
+        Save every character in the session
+        
+        Returns: True if successful
+        Raises: CharacterVersionConflictError if a character's save is
+                newer than the copy in this session
+        """
+        location = _save_location(self.save_directory)
+        with _save_versions_lock:
+            for character in self.characters:
+                current = _save_versions.get((location, character["name"]), 0)
+                version = getattr(character, "version", current)
+                if version != current:
+                    raise CharacterVersionConflictError(
+                        f"{character['name']} was saved at version {current} "
+                        f"after this copy was loaded at version {version}"
+                    )
+
+        for character in self.characters:
+            save_character(character, self.save_directory)
+            key = (location, character["name"])
+            with _save_versions_lock:
+                _save_versions[key] = _save_versions.get(key, 0) + 1
+                if isinstance(character, TrackedCharacter):
+                    character.version = _save_versions[key]
+        return True
+
+def _lock_stripe(character_name):
+    """Index of the lock that guards a character"""
+    return hash(character_name) % LOCK_STRIPES
+
+def _save_location(save_directory):
+    """Key for where save_character currently writes"""
+    if _save_backend is not None:
+        return id(_save_backend)
+    return os.path.abspath(save_directory)
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+class CharacterCache:
+    """
+    Bounded cache of loaded characters, least recently used out first
+    
+    get() returns a copy of the cached character when there is one, so a
+    character that was just saved or is loaded again soon never reads
+    from disk. The cache keeps its own copy of each character, taken when
+    it is loaded or put, so changes made to a character after put() or
+    get() do not reach the cache until it is put again.
+    
+    The cache holds at most max_size characters, and an entry older than
+    ttl seconds is loaded again. An entry put with dirty=True is written
+    back with save_character, or the save function given, before it
+    leaves the cache; other entries are never written.
+    
+    stats() returns the hit, miss, eviction and write-back counters.
+    
+    Example:
+        cache = CharacterCache(max_size=1000, ttl=300)
+        character = cache.get("Hero")
+    """
+
+    def __init__(self, max_size=256, ttl=None, save_directory="data/save_games",
+                 save=None, clock=time.monotonic):
+        """
+        Args:
+            max_size: Largest number of cached characters
+            ttl: Seconds an entry stays fresh (None for no limit)
+            save_directory: Directory characters are loaded from and written back to
+            save: Function called with a character to write it back
+                  (save_character into save_directory by default; pass
+                  SaveQueue.put to keep write-backs in order with queued saves)
+            clock: Function returning the current time in seconds
+        """
+        self.max_size = max_size
+        self.save = save or (lambda character: save_character(character, save_directory))
+        self.ttl = ttl
+        self.save_directory = save_directory
+        self.clock = clock
+        # {name: [character, time loaded or put, dirty]}, least recent first
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "writebacks": 0}
+
+    def get(self, character_name):
+        """
+        Return a copy of a character, loading it with load_character on a miss
+        
+        The file is read without holding the cache lock, so a miss does
+        not hold up other threads using the cache.
+        
+        Raises: The errors of load_character
+        """
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is not None:
+                if self.ttl is None or self.clock() - entry[1] < self.ttl:
+                    self._entries.move_to_end(character_name)
+                    self._stats["hits"] += 1
+                    return _copy_character(entry[0])
+                self._evict(character_name)
+            self._stats["misses"] += 1
+        character = load_character(character_name, self.save_directory)
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is not None:
+                # Put or loaded by another thread while this one was reading
+                return _copy_character(entry[0])
+            self._insert(_copy_character(character), False)
+        return character
+
+    def put(self, character, dirty=True):
+        """
+        Cache a copy of a character, replacing any cached copy
+        
+        Args:
+            character: Character dictionary
+            dirty: True if it has changes that are not saved yet, so the
+                   cache must write it back; False if it matches its save
+        """
+        copy = _copy_character(character)
+        if isinstance(copy, TrackedCharacter):
+            if not dirty:
+                copy.dirty.clear()
+            elif not copy.dirty:
+                # Unsaved, but the changed fields are unknown: write them all
+                copy.dirty.update(copy)
+        with self._lock:
+            entry = self._entries.pop(character["name"], None)
+            if dirty and entry is not None and entry[2] and isinstance(copy, TrackedCharacter):
+                # The replaced copy's unsaved fields still have to be written
+                copy.dirty.update(getattr(entry[0], "dirty", ()))
+            self._insert(copy, dirty)
+
+    def discard(self, character_name):
+        """Drop a character from the cache without writing it back"""
+        with self._lock:
+            self._entries.pop(character_name, None)
+
+    def flush(self):
+        """Write back every dirty entry, keeping them cached"""
+        with self._lock:
+            for entry in self._entries.values():
+                self._write_back(entry)
+
+    def clear(self):
+        """Write back every dirty entry and empty the cache"""
+        with self._lock:
+            self.flush()
+            self._entries.clear()
+
+    def stats(self):
+        """Counters: hits, misses, evictions, writebacks and current size"""
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+    def __contains__(self, character_name):
+        return character_name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _insert(self, character, dirty):
+        """Add an entry, evicting the least recently used beyond max_size"""
+        self._entries[character["name"]] = [character, self.clock(), dirty]
+        while len(self._entries) > self.max_size:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, character_name):
+        """Remove an entry, writing it back first if it is dirty"""
+        entry = self._entries.pop(character_name)
+        self._stats["evictions"] += 1
+        self._write_back(entry)
+
+    def _write_back(self, entry):
+        """Save an entry's character if it was put with unsaved changes"""
+        if entry[2]:
+            self.save(entry[0])
+            entry[2] = False
+            self._stats["writebacks"] += 1
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -332,7 +2284,9 @@ def validate_character_data(character):
         if not isinstance(character[field], int):
             raise InvalidSaveDataError
         
-    list_values = ["inventory", "active_quests", "completed_quests"]
+    if not isinstance(character["inventory"], (list, Inventory)):
+        raise InvalidSaveDataError
+    list_values = ["active_quests", "completed_quests"]
     for field in list_values:
         if not isinstance(character[field], list):
             raise InvalidSaveDataError
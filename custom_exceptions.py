@@ -67,6 +67,10 @@ class InsufficientLevelError(CharacterError):
     """Raised when character level is too low for an action"""
     pass
 
+class CharacterVersionConflictError(CharacterError):
+    """Raised when saving a character whose save changed since it was loaded"""
+    pass
+
 # Combat Exceptions
 class InvalidTargetError(CombatError):
     """Raised when trying to target an invalid enemy"""
@@ -97,6 +101,10 @@ class QuestNotActiveError(QuestError):
     """Raised when trying to complete a quest that isn't active"""
     pass
 
+class CircularPrerequisiteError(QuestError):
+    """Raised when quest prerequisites form a cycle"""
+    pass
+
 # Inventory Exceptions
 class InventoryFullError(InventoryError):
     """Raised when trying to add items to a full inventory"""
@@ -10,12 +10,188 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import glob
+import hashlib
+import mmap
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# ============================================================================
+# FIELD SCHEMAS
+# ============================================================================
+
+VALID_ITEM_TYPES = ("weapon", "armor", "consumable")
+
+def _parse_prerequisite(value):
+    """Convert a PREREQUISITE value, where NONE means no prerequisite"""
+    return None if value.upper() == "NONE" else value
+
+def _parse_item_type(value):
+    """Convert and check an item TYPE value"""
+    item_type = value.lower()
+    if item_type not in VALID_ITEM_TYPES:
+        raise InvalidDataFormatError(f"Invalid item type: {value}")
+    return item_type
+
+def _parse_effect(value):
+    """Convert an EFFECT value like "strength:5" into {"strength": 5}"""
+    stat, sep, amount = value.partition(":")
+    if not sep:
+        raise InvalidDataFormatError(f"Invalid effect format: {value}")
+    return {stat.strip().lower(): int(amount)}
+
+def _compile_field_check(schema):
+    """
+    Build a validator that checks a parsed record has every schema field
+    
+    Records only ever receive keys from the schema, so a record with the
+    right number of keys is complete and the common case costs one len().
+    
+    Returns: Function that takes a record and raises InvalidDataFormatError
+             naming the first missing field
+    """
+    fields = [target for target, convert in schema.values()]
+    field_count = len(fields)
+
+    def check_fields(record):
+        if len(record) == field_count:
+            return
+        for field in fields:
+            if field not in record:
+                raise InvalidDataFormatError(f"Missing field: {field}")
+
+    return check_fields
+
+# File key -> (dictionary key, converter), in the order fields appear in files.
+# A converter of None keeps the stripped text as is.
+QUEST_SCHEMA = {
+    "QUEST_ID": ("quest_id", None),
+    "TITLE": ("title", None),
+    "DESCRIPTION": ("description", None),
+    "REWARD_XP": ("reward_xp", int),
+    "REWARD_GOLD": ("reward_gold", int),
+    "REQUIRED_LEVEL": ("required_level", int),
+    "PREREQUISITE": ("prerequisite", _parse_prerequisite),
+}
+
+ITEM_SCHEMA = {
+    "ITEM_ID": ("item_id", None),
+    "NAME": ("name", None),
+    "TYPE": ("type", _parse_item_type),
+    "EFFECT": ("effect", _parse_effect),
+    "COST": ("cost", int),
+    "DESCRIPTION": ("description", None),
+}
+
+QUEST_FIELDS = [target for target, convert in QUEST_SCHEMA.values()]
+ITEM_FIELDS = [target for target, convert in ITEM_SCHEMA.values()]
+
+_check_quest_fields = _compile_field_check(QUEST_SCHEMA)
+_check_item_fields = _compile_field_check(ITEM_SCHEMA)
+
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class _Record(Mapping):
+    """
+    Base class for compact, read-only data records
+    
+    Records keep their fields in __slots__ instead of a per-record dict,
+    but still support the mapping access the rest of the game uses on
+    quest and item data (record["field"], record.get(), "field" in record,
+    keys/values/items) and compare equal to a dict with the same fields.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return all(getattr(self, field) == getattr(other, field) for field in self._fields)
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Return the record as a plain dictionary"""
+        return {field: self[field] for field in self._fields}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dictionary made by the block parsers"""
+        return cls(*[data[field] for field in cls._fields])
+
+class Quest(_Record):
+    """Quest record; fields are the same as the quest dictionaries"""
+    __slots__ = ("quest_id", "title", "description", "reward_xp",
+                 "reward_gold", "required_level", "prerequisite")
+    _fields = __slots__
+
+    def __init__(self, quest_id, title, description, reward_xp,
+                 reward_gold, required_level, prerequisite):
+        self.quest_id = sys.intern(quest_id)
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        self.prerequisite = None if prerequisite is None else sys.intern(prerequisite)
+
+class Item(_Record):
+    """
+    Item record; fields are the same as the item dictionaries
+    
+    The effect is stored pre-split as a (stat, value) pair in item.effect.
+    item["effect"] still returns the {stat: value} dictionary the parser
+    produces, so existing callers see no difference.
+    """
+    __slots__ = ("item_id", "name", "type", "effect", "cost", "description")
+    _fields = __slots__
+
+    def __init__(self, item_id, name, type, effect, cost, description):
+        self.item_id = sys.intern(item_id)
+        self.name = name
+        self.type = sys.intern(type)
+        if isinstance(effect, dict):
+            ((stat, value),) = effect.items()
+        else:
+            stat, value = effect
+        self.effect = (sys.intern(stat), value)
+        self.cost = cost
+        self.description = description
+
+    def __getitem__(self, key):
+        if key == "effect":
+            stat, value = self.effect
+            return {stat: value}
+        return _Record.__getitem__(self, key)
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
@@ -33,62 +209,13 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Returns: Dictionary of quests {quest_id: Quest record}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            file = f.read()
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Quest file {filename} not found")
-    except (PermissionError, OSError):
-        raise CorruptedDataError(f"Quest file {filename} is corrupted or unreadable")
-
-    sections = [section.strip() for section in file.split("\n\n") if section.strip()]
     quests = {}
-    for section in sections:
-        data = {}
-        try:
-            for line in section.splitlines():
-                if ":" not in line:
-                    raise InvalidDataFormatError(f"Invalid line format: {line}")
-                key, value = line.split(":", 1)
-                key = key.strip().upper()
-                value = value.strip()
-
-                if key == "QUEST_ID":
-                    quest_id = value
-                    data["quest_id"] = value
-                elif key == "TITLE":
-                    data["title"] = value
-                elif key == "DESCRIPTION":
-                    data["description"] = value
-                elif key == "REWARD_XP":
-                    data["reward_xp"] = int(value)
-                elif key == "REWARD_GOLD":
-                    data["reward_gold"] = int(value)
-                elif key == "REQUIRED_LEVEL":
-                    data["required_level"] = int(value)
-                elif key == "PREREQUISITE":
-                    data["prerequisite"] = None if value.upper() == "NONE" else value
-                else:
-                    raise InvalidDataFormatError(f"Not a real field: {key}")
-            fields = ["quest_id", "title", "description", "reward_xp", "reward_gold", "required_level", "prerequisite"]
-            for field in fields:
-                if field not in data:
-                    raise InvalidDataFormatError(f"Missing field: {field}")
-            quests[quest_id] = data
-           
-           
-        except ValueError:
-            raise InvalidDataFormatError("Invalid data format")
-        except InvalidDataFormatError:
-            raise
-        except Exception as e:
-            raise CorruptedDataError(f"Corrupted Data error: {e}")
-    
+    for quest in iter_quests(filename):
+        quests[quest["quest_id"]] = quest
     return quests
-    pass
 
 def load_items(filename="data/items.txt"):
     """
@@ -102,62 +229,45 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    Returns: Dictionary of items {item_id: Item record}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            file = f.read()
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Item file {filename} not found")
-    except (PermissionError, OSError):
-        raise CorruptedDataError(f"Item file {filename} is corrupted or unreadable")
-
-    sections = [section.strip() for section in file.split("\n\n") if section.strip()]
     items = {}
-    for section in sections:
-        data = {}
+    for item in iter_items(filename):
+        items[item["item_id"]] = item
+    return items
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quests from file one record at a time
+    
+    The file is read line by line and each quest is yielded as soon as
+    its blank-line separator (or the end of the file) is reached, so
+    memory stays bounded by a single record.
+    
+    Yields: Quest records in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for line_number, lines in _iter_blocks(filename, "Quest"):
         try:
-            for line in section.splitlines():
-                if ":" not in line:
-                    raise InvalidDataFormatError(f"Invalid line format: {line}")
-                key, value = line.split(":", 1)
-                key = key.strip().upper()
-                value = value.strip()
-
-                if key == "ITEM_ID":
-                    item_id = value
-                    data["item_id"] = value
-                elif key == "NAME":
-                    data["name"] = value
-                elif key == "TYPE":
-                    if value.lower() not in ["weapon", "armor", "consumable"]:
-                        raise InvalidDataFormatError(f"Invalid item type: {value}")
-                    data["type"] = value.lower()
-                elif key == "EFFECT":
-                    if ":" not in value:
-                        raise InvalidDataFormatError(f"Invalid effect format: {value}")
-                    stat, amount = value.split(":", 1)
-                    data["effect"] = {stat.strip().lower(): int(amount.strip())}
-                elif key == "COST":
-                    data["cost"] = int(value)
-                elif key == "DESCRIPTION":
-                    data["description"] = value
-                else:
-                    raise InvalidDataFormatError(f"Not a real field: {key}")
-            fields = ["item_id", "name", "type", "effect", "cost", "description"]
-            for field in fields:
-                if field not in data:
-                    raise InvalidDataFormatError(f"Missing field: {field}")
-            
-            items[item_id] = data
+            yield Quest.from_dict(parse_quest_block(lines))
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{filename}, line {line_number}: {e}")
 
-        except ValueError:
-            raise InvalidDataFormatError("Invalid data format")
-        except Exception as e:
-            raise CorruptedDataError(f"Corrupted Data error: {e}")
-    return items
-    pass
+def iter_items(filename="data/items.txt"):
+    """
+    Stream items from file one record at a time
+    
+    Works like iter_quests but for the item format.
+    
+    Yields: Item records in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for line_number, lines in _iter_blocks(filename, "Item"):
+        try:
+            yield Item.from_dict(parse_item_block(lines))
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{filename}, line {line_number}: {e}")
 
 
 def validate_quest_data(quest_dict):
@@ -170,11 +280,7 @@ def validate_quest_data(quest_dict):
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields
     """
-    required_fields = [
-        "quest_id", "title", "description",
-        "reward_xp", "reward_gold", "required_level", "prerequisite"
-    ]
-    for field in required_fields:
+    for field in QUEST_FIELDS:
         if field not in quest_dict:
             raise InvalidDataFormatError(f"Missing field: {field}")
 
@@ -199,13 +305,11 @@ def validate_item_data(item_dict):
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields or invalid type
     """
-    required_fields = ["item_id", "name", "type", "effect", "cost", "description"]
-    for field in required_fields:
+    for field in ITEM_FIELDS:
         if field not in item_dict:
             raise InvalidDataFormatError(f"Missing field: {field}")
 
-    valid_items = ["weapon", "armor", "consumable"]
-    if item_dict["type"].lower() not in valid_items:
+    if item_dict["type"].lower() not in VALID_ITEM_TYPES:
         raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
 
     if not isinstance(item_dict["cost"], int):
@@ -277,10 +381,541 @@ def create_default_data_files():
 
     pass
 
+# ============================================================================
+# COMPILED CACHE
+# ============================================================================
+
+# Compiled caches are written next to their source, e.g. data/quests.txt.cache
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 2
+
+def load_quests_cached(filename="data/quests.txt"):
+    """
+    Load quest data, using a compiled cache when the source is unchanged
+    
+    Returns: Same dictionary as load_quests
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _load_cached(filename, load_quests)
+
+def load_items_cached(filename="data/items.txt"):
+    """
+    Load item data, using a compiled cache when the source is unchanged
+    
+    Returns: Same dictionary as load_items
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _load_cached(filename, load_items)
+
+def _load_cached(filename, loader):
+    """
+    Load a data file through its compiled cache
+    
+    The cache is used only when the source size, modification time and
+    SHA-256 hash all match what was recorded when the cache was written.
+    A source that was only touched (same size and hash) reuses the cached
+    data and refreshes the recorded mtime. Anything else falls back to a
+    full parse with the given loader and rewrites the cache.
+    
+    Args:
+        filename: Source data file
+        loader: load_quests or load_items
+    
+    Returns: Parsed data dictionary
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    try:
+        stat = os.stat(filename)
+        with open(filename, "rb") as f:
+            # Hashed in chunks, so a large pack is never held in memory whole
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file {filename} not found")
+    except (PermissionError, OSError):
+        raise CorruptedDataError(f"Data file {filename} is corrupted or unreadable")
+
+    cache_file = filename + CACHE_SUFFIX
+    cache = _read_cache(cache_file)
+    if (cache is not None
+            and cache["loader"] == loader.__name__
+            and cache["size"] == stat.st_size
+            and cache["sha256"] == digest):
+        if cache["mtime_ns"] != stat.st_mtime_ns:
+            cache["mtime_ns"] = stat.st_mtime_ns
+            _write_cache(cache_file, cache)
+        return cache["data"]
+
+    data = loader(filename)
+    _write_cache(cache_file, {
+        "version": CACHE_VERSION,
+        "loader": loader.__name__,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+        "data": data,
+    })
+    return data
+
+def _read_cache(cache_file):
+    """
+    Read a compiled cache file
+    
+    Returns: Cache dictionary, or None if it is missing, unreadable,
+             or from a different CACHE_VERSION
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            cache = pickle.load(f)
+    except Exception:
+        # A missing or damaged cache is never fatal, the source is always there
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    return cache
+
+def _write_cache(cache_file, cache):
+    """
+    Write a compiled cache file atomically
+    
+    Failing to write the cache (read-only data directory, full disk)
+    only costs a re-parse next time, so errors are ignored.
+    """
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, "wb") as f:
+            pickle.dump(cache, f, protocol=5)
+        os.replace(temp_file, cache_file)
+    except (PermissionError, OSError):
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+# ============================================================================
+# ITEM CATALOG
+# ============================================================================
+
+class ItemCatalog(Mapping):
+    """
+    Read-only, dictionary-like view of an item file that parses lazily
+    
+    The file is memory-mapped and scanned once to record where each item's
+    block starts and how long it is. A record is parsed only the first time
+    it is looked up and is then kept in a bounded LRU, so only the items a
+    session actually touches are ever materialized.
+    
+    Supports the dict operations the game uses on load_items() results:
+    catalog[item_id], item_id in catalog, len(), iteration, .get(),
+    .keys(), .values() and .items().
+    """
+
+    def __init__(self, filename="data/items.txt", cache_size=256):
+        """
+        Map and index an item file
+        
+        Args:
+            filename: Item data file
+            cache_size: Maximum number of parsed items kept in memory
+        
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        self.filename = filename
+        self.cache_size = cache_size
+        self._index = {}
+        self._records = OrderedDict()
+        self._mm = None
+        try:
+            with open(filename, "rb") as f:
+                if os.fstat(f.fileno()).st_size > 0:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Item file {filename} not found")
+        except (PermissionError, OSError, ValueError):
+            raise CorruptedDataError(f"Item file {filename} is corrupted or unreadable")
+        if self._mm is not None:
+            self._scan()
+
+    def _scan(self):
+        """
+        Build the item_id -> (offset, length) index in one pass over the map
+        
+        Raises: InvalidDataFormatError if a block has no ITEM_ID line
+        """
+        mm = self._mm
+        mm.seek(0)
+        block_start = None
+        block_line = 0
+        item_id = None
+        line_number = 0
+        while True:
+            offset = mm.tell()
+            line = mm.readline()
+            line_number += 1
+            if not line or not line.strip():
+                if block_start is not None:
+                    if item_id is None:
+                        raise InvalidDataFormatError(
+                            f"{self.filename}, line {block_line}: Missing field: item_id"
+                        )
+                    self._index[item_id] = (block_start, offset - block_start)
+                    block_start = None
+                    item_id = None
+                if not line:
+                    break
+                continue
+            if block_start is None:
+                block_start = offset
+                block_line = line_number
+            key, sep, value = line.partition(b":")
+            if sep and key.strip().upper() == b"ITEM_ID":
+                item_id = value.strip().decode("utf-8")
+
+    def __getitem__(self, item_id):
+        record = self._records.get(item_id)
+        if record is not None:
+            self._records.move_to_end(item_id)
+            return record
+
+        offset, length = self._index[item_id]
+        try:
+            block = self._mm[offset:offset + length].decode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            raise CorruptedDataError(f"Item file {self.filename} is corrupted or unreadable")
+        try:
+            record = Item.from_dict(parse_item_block(block.splitlines()))
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{self.filename}, byte {offset}: {e}")
+
+        self._records[item_id] = record
+        if len(self._records) > self.cache_size:
+            self._records.popitem(last=False)
+        return record
+
+    def __contains__(self, item_id):
+        return item_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, item_id, default=None):
+        if item_id not in self._index:
+            return default
+        return self[item_id]
+
+    def close(self):
+        """Release the memory map; the catalog cannot be read afterwards"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._records.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# CONTENT PACKS
+# ============================================================================
+
+def load_content_pack(directory, workers=None):
+    """
+    Load every quest and item shard in a content pack directory
+    
+    Shards are files named quests.txt / quests_*.txt and items.txt /
+    items_*.txt. They are parsed in parallel in a process pool and merged
+    in sorted filename order, so the result does not depend on which
+    worker finishes first. When an ID appears more than once, the first
+    definition (in that order) is kept and every later one is reported
+    as a conflict.
+    
+    Args:
+        directory: Content pack directory
+        workers: Number of worker processes (default: CPU count).
+                 1 parses everything in the current process.
+    
+    Returns: Dictionary with:
+             - quests: {quest_id: quest_data_dict}
+             - items: {item_id: item_data_dict}
+             - conflicts: list of {kind, id, shard, first_shard} dicts
+    Raises:
+        MissingDataFileError if the directory has no shards
+        InvalidDataFormatError, CorruptedDataError from the first bad shard,
+        with the shard name and line number in the message
+    """
+    shards = _find_shards(directory)
+    if not shards:
+        raise MissingDataFileError(f"No quest or item shards found in {directory}")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(shards))
+
+    if workers <= 1:
+        results = [_load_shard(kind, path) for kind, path in shards]
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(_load_shard, kind, path) for kind, path in shards]
+            results = [future.result() for future in futures]
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    pack = {"quests": {}, "items": {}, "conflicts": []}
+    origins = {"quests": {}, "items": {}}
+    for (kind, path), records in zip(shards, results):
+        shard = os.path.basename(path)
+        id_key = "quest_id" if kind == "quests" else "item_id"
+        merged = pack[kind]
+        for record in records:
+            record_id = record[id_key]
+            if record_id in merged:
+                pack["conflicts"].append({
+                    "kind": kind,
+                    "id": record_id,
+                    "shard": shard,
+                    "first_shard": origins[kind][record_id],
+                })
+                continue
+            merged[record_id] = record
+            origins[kind][record_id] = shard
+    return pack
+
+def _find_shards(directory):
+    """
+    List the shard files of a content pack
+    
+    Returns: Sorted list of (kind, path) tuples, kind being "quests" or "items"
+    Raises: MissingDataFileError if the directory does not exist
+    """
+    if not os.path.isdir(directory):
+        raise MissingDataFileError(f"Content pack directory {directory} not found")
+    shards = []
+    for kind in ["quests", "items"]:
+        paths = glob.glob(os.path.join(directory, f"{kind}.txt"))
+        paths += glob.glob(os.path.join(directory, f"{kind}_*.txt"))
+        for path in sorted(paths):
+            shards.append((kind, path))
+    return shards
+
+def _load_shard(kind, path):
+    """
+    Parse one shard; runs inside a worker process
+    
+    Returns: List of records in file order (duplicates included, so the
+             parent can report them)
+    """
+    if kind == "quests":
+        return list(iter_quests(path))
+    return list(iter_items(path))
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class DataWatcher:
+    """
+    Reload quest and item data when the files change, without a restart
+    
+    The watcher polls file modification times (no external service) and
+    re-parses only the files that changed. For each changed file it
+    computes a per-ID diff against the data it currently holds, swaps in
+    the new dictionary in a single assignment, and passes the diff to
+    every subscriber so dependent indexes can update incrementally.
+    
+    Diffs are dictionaries with:
+    - added: {id: new_record}
+    - removed: {id: old_record}
+    - changed: {id: (old_record, new_record)}
+    
+    Subscribers are called as callback(kind, diff, data) where kind is
+    "quests" or "items" and data is the new dictionary.
+    """
+
+    def __init__(self, quests_file="data/quests.txt", items_file="data/items.txt",
+                 quest_loader=None, item_loader=None):
+        """
+        Args:
+            quests_file, items_file: Files to watch
+            quest_loader, item_loader: Parsers to use (default: the cached loaders)
+        """
+        self.files = {
+            "quests": (quests_file, quest_loader or load_quests_cached),
+            "items": (items_file, item_loader or load_items_cached),
+        }
+        self.data = {"quests": {}, "items": {}}
+        self._signatures = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def subscribe(self, callback):
+        """Register callback(kind, diff, data) to run after each reload"""
+        self._subscribers.append(callback)
+
+    def load(self):
+        """
+        Load both files in full and start tracking their modification times
+        
+        Returns: Tuple of (quests, items) dictionaries
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        with self._lock:
+            for kind, (filename, loader) in self.files.items():
+                signature = _file_signature(filename)
+                self.data[kind] = loader(filename)
+                self._signatures[kind] = signature
+        return self.data["quests"], self.data["items"]
+
+    def poll(self):
+        """
+        Check both files once and reload the ones that changed
+        
+        Every changed file is parsed before any data is swapped in. A file
+        that fails to parse keeps its loaded data and is retried on the
+        next poll, but the files that did parse are still swapped in and
+        reported to subscribers before the error is raised. A subscriber
+        that raises does not stop the others; the first error is raised
+        once every subscriber has run.
+        
+        Returns: Dictionary {kind: diff} for the files that were reloaded
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError,
+                or the first error raised by a subscriber
+        """
+        errors = []
+        reloaded = {}
+        with self._lock:
+            parsed = {}
+            for kind, (filename, loader) in self.files.items():
+                try:
+                    signature = _file_signature(filename)
+                    if signature != self._signatures.get(kind):
+                        parsed[kind] = (signature, loader(filename))
+                except Exception as e:
+                    errors.append(e)
+
+            for kind, (signature, new_data) in parsed.items():
+                reloaded[kind] = (diff_records(self.data[kind], new_data), new_data)
+                self.data[kind] = new_data
+                self._signatures[kind] = signature
+
+        for kind, (diff, new_data) in reloaded.items():
+            for callback in self._subscribers:
+                try:
+                    callback(kind, diff, new_data)
+                except Exception as e:
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+        return {kind: diff for kind, (diff, new_data) in reloaded.items()}
+
+    def start(self, interval=2.0, on_error=None):
+        """
+        Poll in a background daemon thread every interval seconds
+        
+        Args:
+            interval: Seconds between polls
+            on_error: Called with the exception when a poll fails
+                      (default: the error is ignored and retried)
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    if on_error is not None:
+                        on_error(e)
+
+        self._thread = threading.Thread(target=run, name="DataWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread started by start()"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+def diff_records(old, new):
+    """
+    Compare two {id: record} dictionaries
+    
+    Returns: Dictionary with added, removed and changed entries
+             (see DataWatcher for the format)
+    """
+    diff = {"added": {}, "removed": {}, "changed": {}}
+    for record_id, record in new.items():
+        if record_id not in old:
+            diff["added"][record_id] = record
+        elif old[record_id] != record:
+            diff["changed"][record_id] = (old[record_id], record)
+    for record_id, record in old.items():
+        if record_id not in new:
+            diff["removed"][record_id] = record
+    return diff
+
+def _file_signature(filename):
+    """
+    Return (mtime_ns, size) for a watched file
+    
+    Raises: MissingDataFileError if the file does not exist
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file {filename} not found")
+    return stat.st_mtime_ns, stat.st_size
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _iter_blocks(filename, label):
+    """
+    Read a data file line by line and group it into blank-line separated blocks
+    
+    Args:
+        filename: Path of the data file
+        label: "Quest" or "Item", used in error messages
+    
+    Yields: Tuples of (line number the block starts on, list of stripped lines)
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    try:
+        f = open(filename, "r", encoding="utf-8")
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{label} file {filename} not found")
+    except (PermissionError, OSError):
+        raise CorruptedDataError(f"{label} file {filename} is corrupted or unreadable")
+
+    with f:
+        block = []
+        start = 0
+        try:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if line:
+                    if not block:
+                        start = line_number
+                    block.append(line)
+                elif block:
+                    yield start, block
+                    block = []
+        except (UnicodeDecodeError, OSError) as e:
+            raise CorruptedDataError(f"{label} file {filename} is corrupted or unreadable: {e}")
+        if block:
+            yield start, block
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -291,45 +926,7 @@ def parse_quest_block(lines):
     Returns: Dictionary with quest data
     Raises: InvalidDataFormatError if parsing fails
     """
-    quest = {}
-    try:
-        for line in lines:
-            if ":" not in line:
-                raise InvalidDataFormatError(f"Invalid line format: {line}")
-            key, value = line.split(":", 1)
-            key = key.strip().upper()
-            value = value.strip()
-
-            if key == "QUEST_ID":
-                quest["quest_id"] = value
-            elif key == "TITLE":
-                quest["title"] = value
-            elif key == "DESCRIPTION":
-                quest["description"] = value
-            elif key == "REWARD_XP":
-                quest["reward_xp"] = int(value)
-            elif key == "REWARD_GOLD":
-                quest["reward_gold"] = int(value)
-            elif key == "REQUIRED_LEVEL":
-                quest["required_level"] = int(value)
-            elif key == "PREREQUISITE":
-                quest["prerequisite"] = None if value.upper() == "NONE" else value
-            else:
-                raise InvalidDataFormatError(f"Unexpected field: {key}")
-
-        fields = ["quest_id", "title", "description", "reward_xp",
-                    "reward_gold", "required_level", "prerequisite"]
-        for field in fields:
-            if field not in quest:
-                raise InvalidDataFormatError(f"Missing field: {field}")
-
-        return quest
-
-    except ValueError:
-        raise InvalidDataFormatError("Can not parse field")
-    except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing quest block: {e}")
-    pass
+    return _parse_block(lines, QUEST_SCHEMA, _check_quest_fields)
 
 def parse_item_block(lines):
     """
@@ -341,47 +938,43 @@ def parse_item_block(lines):
     Returns: Dictionary with item data
     Raises: InvalidDataFormatError if parsing fails
     """
-    item = {}
-    try:
-        for line in lines:
-            if ":" not in line:
-                raise InvalidDataFormatError(f"Invalid line format: {line}")
-            key, value = line.split(":", 1)
-            key = key.strip().upper()
-            value = value.strip()
-
-            if key == "ITEM_ID":
-                item["item_id"] = value
-            elif key == "NAME":
-                item["name"] = value
-            elif key == "TYPE":
-                if value.lower() not in ["weapon", "armor", "consumable"]:
-                    raise InvalidDataFormatError(f"Invalid item type: {value}")
-                item["type"] = value.lower()
-            elif key == "EFFECT":
-                if ":" not in value:
-                    raise InvalidDataFormatError(f"Invalid effect format: {value}")
-                stat, amount = value.split(":", 1)
-                item["effect"] = {stat.strip().lower(): int(amount.strip())}
-            elif key == "COST":
-                item["cost"] = int(value)
-            elif key == "DESCRIPTION":
-                item["description"] = value
-            else:
-                raise InvalidDataFormatError(f"Unexpected field: {key}")
-
-        fields = ["item_id", "name", "type", "effect", "cost", "description"]
-        for field in fields:
-            if field not in item:
-                raise InvalidDataFormatError(f"Missing field: {field}")
+    return _parse_block(lines, ITEM_SCHEMA, _check_item_fields)
 
-        return item
-
-    except ValueError:
-        raise InvalidDataFormatError("Can not parse field")
-    except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing item block: {e}")
-    pass
+def _parse_block(lines, schema, check_fields):
+    """
+    Parse one record using a field schema
+    
+    Each line is looked up in the schema with a single dictionary access
+    instead of walking an if/elif chain.
+    
+    Args:
+        lines: List of "KEY: value" strings
+        schema: Field schema such as QUEST_SCHEMA or ITEM_SCHEMA
+        check_fields: Validator made by _compile_field_check for that schema
+    
+    Returns: Dictionary with the converted record
+    Raises: InvalidDataFormatError if a line, field or value is invalid
+    """
+    record = {}
+    for line in lines:
+        key, sep, value = line.partition(":")
+        if not sep:
+            raise InvalidDataFormatError(f"Invalid line format: {line}")
+        field = schema.get(key)
+        if field is None:
+            field = schema.get(key.strip().upper())
+            if field is None:
+                raise InvalidDataFormatError(f"Unexpected field: {key.strip()}")
+        target, convert = field
+        if convert is None:
+            record[target] = value.strip()
+            continue
+        try:
+            record[target] = convert(value.strip())
+        except ValueError:
+            raise InvalidDataFormatError(f"Can not parse field {key.strip()}: {value.strip()}")
+    check_fields(record)
+    return record
 
 # ============================================================================
 # TESTING
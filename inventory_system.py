@@ -15,6 +15,7 @@ from custom_exceptions import (
     InsufficientResourcesError,
     InvalidItemTypeError
 )
+import character_manager
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
@@ -34,12 +35,13 @@ def add_item_to_inventory(character, item_id):
     Returns: True if added successfully
     Raises: InventoryFullError if inventory is at max capacity
     """
-    inventory = character.setdefault("inventory", [])
+    inventory = character_manager.get_inventory(character)
 
     if len(inventory) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full")
 
     inventory.append(item_id)
+    character_manager.mark_dirty(character, "inventory")
     return True
     pass
 
@@ -54,11 +56,12 @@ def remove_item_from_inventory(character, item_id):
     Returns: True if removed successfully
     Raises: ItemNotFoundError if item not in inventory
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     if item_id not in inventory:
         raise ItemNotFoundError(f"Item {item_id} not found in inventory")
 
     inventory.remove(item_id)
+    character_manager.mark_dirty(character, "inventory")
     return True
 
     pass
@@ -69,7 +72,7 @@ def has_item(character, item_id):
     
     Returns: True if item in inventory, False otherwise
     """
-    return item_id in character.get("inventory", [])
+    return item_id in character_manager.get_inventory(character)
     pass
 
 def count_item(character, item_id):
@@ -78,7 +81,7 @@ def count_item(character, item_id):
     
     Returns: Integer count of item
     """
-    return character.get("inventory", []).count(item_id)
+    return character_manager.get_inventory(character).count(item_id)
     pass
 
 def get_inventory_space_remaining(character):
@@ -87,7 +90,7 @@ def get_inventory_space_remaining(character):
     
     Returns: Integer representing available slots
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     return MAX_INVENTORY_SIZE - len(inventory)
     pass
 
@@ -97,9 +100,9 @@ def clear_inventory(character):
     
     Returns: List of removed items
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     removed_items = list(inventory)
-    character["inventory"] = []
+    character["inventory"] = character_manager.Inventory()
 
     return removed_items
     pass
@@ -128,7 +131,7 @@ def use_item(character, item_id, item_data):
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'consumable'
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     if item_id not in inventory:
         raise ItemNotFoundError(f"Item {item_id} not found in inventory")
 
@@ -157,6 +160,7 @@ def use_item(character, item_id, item_data):
         character[stat] = character.get(stat, 0) + value
 
     inventory.remove(item_id)
+    character_manager.mark_dirty(character, "inventory")
     return f'{character.get("name","Unknown")} used {item.get("name", item_id)} and gained {value} {stat}.'
 
     pass
@@ -181,7 +185,7 @@ def equip_weapon(character, item_id, item_data):
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'weapon'
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     if item_id not in inventory:
         raise ItemNotFoundError(f"Item {item_id} not found in inventory")
 
@@ -197,6 +201,7 @@ def equip_weapon(character, item_id, item_data):
             stat = stat.strip().lower()
             character[stat] -= int(value_str.strip())
         inventory.append(old_weapon_id)
+        character_manager.mark_dirty(character, "inventory")
 
     effect_str = item.get("effect")
     if not effect_str or ":" not in effect_str:
@@ -214,6 +219,7 @@ def equip_weapon(character, item_id, item_data):
     character["equipped_weapon_effect"] = effect_str
 
     inventory.remove(item_id)
+    character_manager.mark_dirty(character, "inventory")
     return f'{character.get("name","Unknown")} equipped {item.get("name", item_id)} (+{value} {stat}).'
 
     pass
@@ -238,7 +244,7 @@ def equip_armor(character, item_id, item_data):
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'armor'
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
 
     if item_id not in inventory:
         raise ItemNotFoundError(f"{item_id} not found in inventory")
@@ -259,6 +265,7 @@ def equip_armor(character, item_id, item_data):
             character[stat] -= int(value)
 
         inventory.append(old_armor_id)
+        character_manager.mark_dirty(character, "inventory")
 
     effect_str = item.get("effect")
     if not effect_str or ":" not in effect_str:
@@ -278,6 +285,7 @@ def equip_armor(character, item_id, item_data):
     character["equipped_armor"] = item_id
 
     inventory.remove(item_id)
+    character_manager.mark_dirty(character, "inventory")
 
     return f"{character["name"]} equipped {item["name"]} (+{value} {stat})."
 
@@ -290,7 +298,7 @@ def unequip_weapon(character):
     Returns: Item ID that was unequipped, or None if no weapon equipped
     Raises: InventoryFullError if inventory is full
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     equipped = character.get("equipped_weapon")
 
     if not equipped:
@@ -303,6 +311,7 @@ def unequip_weapon(character):
         character[stat] -= int(value)
 
     inventory.append(equipped)
+    character_manager.mark_dirty(character, "inventory")
 
     character["equipped_weapon"] = None
     character.pop("equipped_weapon_effect", None)
@@ -317,7 +326,7 @@ def unequip_armor(character):
     Returns: Item ID that was unequipped, or None if no armor equipped
     Raises: InventoryFullError if inventory is full
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     equipped = character.get("equipped_armor")
 
     if not equipped:
@@ -331,6 +340,7 @@ def unequip_armor(character):
         character[stat] -= int(value)
 
     inventory.append(equipped)
+    character_manager.mark_dirty(character, "inventory")
 
     character["equipped_armor"] = None
     character.pop("equipped_armor_effect", None)
@@ -356,9 +366,7 @@ def purchase_item(character, item_id, item_data):
         InsufficientResourcesError if not enough gold
         InventoryFullError if inventory is full
     """
-    if "inventory" not in character:
-        character["inventory"] = []
-    inventory = character["inventory"]
+    inventory = character_manager.get_inventory(character)
 
     cost = item_data.get("cost", 0)
 
@@ -372,6 +380,7 @@ def purchase_item(character, item_id, item_data):
 
     character["gold"] -= cost
     inventory.append(item_id)
+    character_manager.mark_dirty(character, "inventory")
 
     return True
     pass
@@ -388,16 +397,15 @@ def sell_item(character, item_id, item_data):
     Returns: Amount of gold received
     Raises: ItemNotFoundError if item not in inventory
     """
-    if "inventory" not in character:
-        character["inventory"] = []
-    inventory = character["inventory"]
+    inventory = character_manager.get_inventory(character)
 
     if item_id not in inventory:
         raise ItemNotFoundError(f"Item {item_id} not in inventory")
 
     inventory.remove(item_id)
+    character_manager.mark_dirty(character, "inventory")
 
-    sell_value = item_data_dict.get("cost", 0) // 2
+    sell_value = item_data.get("cost", 0) // 2
     character["gold"] = character.get("gold", 0) + sell_value
     return sell_value
     pass
@@ -457,9 +465,7 @@ def display_inventory(character, item_data_dict):
     
     Shows item names, types, and quantities
     """
-    if "inventory" not in character:
-        character["inventory"] = []
-    inventory = character["inventory"]
+    inventory = character_manager.get_inventory(character)
 
     if item_id not in inventory:
         raise ItemNotFoundError(f"Item {item_id} not in inventory")
@@ -470,7 +476,7 @@ def display_inventory(character, item_data_dict):
     character["gold"] = character.get("gold", 0) + sell_value
     
     
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     if not inventory:
         print(f"{character.get('name', 'Unknown')} has an empty inventory.")
         return
@@ -545,23 +551,15 @@ def display_inventory(character, item_data_dict):
     
     Shows item names, types, and quantities
     """
-    inventory = character.get("inventory", [])
+    inventory = character_manager.get_inventory(character)
     if not inventory:
         print(f"{character.get('name', 'Unknown')} has an empty inventory.")
         return
 
-    item_counts = {}
-    for item_id in inventory:
-        if item_id in item_counts:
-            item_counts[item_id] += 1
-        else:
-            item_counts[item_id] = 1
-
-
     print(f"\n{character.get('name', 'Unknown')}s Inventory:")
     print("-" * 40)
 
-    for item_id, count in item_counts.items():
+    for item_id, count in inventory.items():
         item_info = item_data_dict.get(item_id, {})
         item_name = item_info.get("name", item_id)
         item_type = item_info.get("type", "Unknown")
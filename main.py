@@ -30,6 +30,9 @@ current_character = None
 all_quests = {}
 all_items = {}
 game_running = False
+data_watcher = None
+save_queue = None
+character_cache = None
 
 # ============================================================================
 # MAIN MENU
@@ -112,7 +115,10 @@ def load_game():
             if 1 <= choice <= len(saved_characters):
                 selected_name = saved_characters[choice - 1]
                 try:
-                    current_character = character_manager.load_character(selected_name)
+                    if character_cache is not None:
+                        current_character = character_cache.get(selected_name)
+                    else:
+                        current_character = character_manager.load_character(selected_name)
                     print(f"Character '{selected_name}' loaded")
                     return current_character
                 except CharacterNotFoundError:
@@ -452,37 +458,76 @@ def shop():
 # ============================================================================
 
 def save_game():
-    """Save current game state"""
+    """Save current game state (written in the background once main() has started the save queue)"""
     global current_character
     try:
-        character_manager.save_character(current_character)
+        if save_queue is not None:
+            save_queue.put(current_character)
+        else:
+            character_manager.save_character(current_character)
+        if character_cache is not None:
+            character_cache.put(current_character, dirty=False)
         print(f"Game saved for {current_character.get('name', 'Unknown')}.")
     except IOError as e:
         print(f"Error saving game: {e}")
     pass
 
+def report_save_error(character_name, error):
+    """Report a background save that failed (called by the save queue)"""
+    print(f"Error saving game for {character_name}: {error}")
+
 def load_game_data():
     """Load all quest and item data from files"""
-    global all_quests, all_items
+    global all_quests, all_items, data_watcher
     
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        data_watcher = game_data.DataWatcher(quest_loader=load_valid_quests)
+        all_quests, all_items = data_watcher.load()
+        data_watcher.subscribe(apply_data_reload)
+        data_watcher.start(on_error=report_data_reload_error)
         print("Game data loaded successfully.")
     except MissingDataFileError:
         print("Data files missing, creating data files")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
+        all_quests = quest_handler.QuestData(game_data.load_quests())
         all_items = game_data.load_items()
     except InvalidDataFormatError:
         print("Data files corrupted or have wrong format")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
+        all_quests = quest_handler.QuestData(game_data.load_quests())
         all_items = game_data.load_items()
     except Exception as e:
         print(f"Error loading game data: {e}")
     pass
 
+def load_valid_quests(filename):
+    """
+    Load quests and check their prerequisites (the data watcher's quest loader)
+    
+    Raising here makes the watcher keep its current quests, so invalid
+    quest data is never swapped in and the file is retried on the next poll.
+    The quests are returned as a QuestData, so the index built by the
+    check serves every quest lookup until the next reload.
+    """
+    quests = quest_handler.QuestData(game_data.load_quests_cached(filename))
+    quest_handler.validate_quest_prerequisites(quests)
+    return quests
+
+def apply_data_reload(kind, diff, data):
+    """Swap in reloaded quest or item data (called by the data watcher)"""
+    global all_quests, all_items
+
+    if kind == "quests":
+        all_quests = data
+    else:
+        all_items = data
+    print(f"Reloaded {kind}: {len(diff['added'])} added, "
+          f"{len(diff['removed'])} removed, {len(diff['changed'])} changed")
+
+def report_data_reload_error(error):
+    """Report a data file that failed to reload; the old data stays in use"""
+    print(f"Could not reload game data: {error}")
+
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
@@ -523,6 +568,7 @@ def display_welcome():
 
 def main():
     """Main game execution function"""
+    global save_queue, character_cache
     
     # Display welcome message
     display_welcome()
@@ -540,6 +586,9 @@ def main():
         print("Please check data files for errors.")
         return
     
+    save_queue = character_manager.SaveQueue(on_error=report_save_error)
+    character_cache = character_manager.CharacterCache(max_size=64, ttl=600, save=save_queue.put)
+    
     # Main menu loop
     while True:
         choice = main_menu()
@@ -549,6 +598,8 @@ def main():
         elif choice == 2:
             load_game()
         elif choice == 3:
+            character_cache.clear()
+            save_queue.drain()
             print("\nThanks for playing Quest Chronicles!")
             break
         else:
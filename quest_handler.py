@@ -14,9 +14,13 @@ from custom_exceptions import (
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    CircularPrerequisiteError,
+    CharacterDeadError,
+    GameError
 )
 import character_manager
+from bisect import bisect_left, bisect_right
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
@@ -47,6 +51,8 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest {quest_id} not found")
 
     quest = quest_data_dict[quest_id]
+    completed = character_manager.get_quest_list(character, "completed_quests")
+    active = character_manager.get_quest_list(character, "active_quests")
 
     if character["level"] < quest["required_level"]:
         raise InsufficientLevelError(
@@ -56,18 +62,19 @@ def accept_quest(character, quest_id, quest_data_dict):
 
     prereq = quest.get("prerequisite")
     if prereq and prereq != "NONE":
-        if prereq not in character.get("completed_quests", []):
+        if prereq not in completed:
             raise QuestRequirementsNotMetError(
                 f"Prerequisite quest {prereq} not completed"
             )
 
-    if quest_id in character.get("completed_quests", []):
+    if quest_id in completed:
         raise QuestAlreadyCompletedError(f"Quest {quest_id} already completed")
 
-    if quest_id in character.get("active_quests", []):
+    if quest_id in active:
         raise QuestRequirementsNotMetError(f"Quest {quest_id} is already active")
 
-    character.setdefault("active_quests", []).append(quest_id)
+    active.append(quest_id)
+    character_manager.mark_dirty(character, "active_quests")
 
     return True
     
@@ -95,13 +102,12 @@ def complete_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest {quest_id} not found")
 
     quest = quest_data_dict[quest_id]
+    active = character_manager.get_quest_list(character, "active_quests")
 
-    if quest_id not in character.get("active_quests", []):
+    if quest_id not in active:
         raise QuestNotActiveError(f"Quest {quest_id} is not active")
 
-    character["active_quests"].remove(quest_id)
-
-    character.setdefault("completed_quests", []).append(quest_id)
+    _record_completion(character, quest_id, quest, quest_data_dict)
 
     xp_reward = quest["reward_xp"]
     gold_reward = quest["reward_gold"]
@@ -117,9 +123,11 @@ def abandon_quest(character, quest_id):
     Returns: True if abandoned
     Raises: QuestNotActiveError if quest not active
     """
-    if quest_id not in character.get("active_quests", []):
+    active = character_manager.get_quest_list(character, "active_quests")
+    if quest_id not in active:
         raise QuestNotActiveError(f"Quest {quest_id} is not active")
-    character["active_quests"].remove(quest_id)
+    active.remove(quest_id)
+    character_manager.mark_dirty(character, "active_quests")
     return True
     pass
 
@@ -159,22 +167,7 @@ def get_available_quests(character, quest_data_dict):
     
     Returns: List of quest dictionaries
     """
-    available = []
-    for quest_id, quest in quest_data_dict.items():
-        if quest_id in character.get("completed_quests", []):
-            continue
-        if quest_id in character.get("active_quests", []):
-            continue
-        if character["level"] < quest["required_level"]:
-            continue
-        prereq = quest.get("prerequisite")
-        if prereq and prereq != "NONE":
-            if prereq not in character.get("completed_quests", []):
-                continue
-
-        available.append(quest)
-
-    return available
+    return get_quest_index(quest_data_dict).available_quests(character)
     pass
 
 # ============================================================================
@@ -187,7 +180,7 @@ def is_quest_completed(character, quest_id):
     
     Returns: True if completed, False otherwise
     """
-    return quest_id in character.get("completed_quests", [])
+    return quest_id in character_manager.get_quest_list(character, "completed_quests")
     pass
 
 def is_quest_active(character, quest_id):
@@ -196,7 +189,7 @@ def is_quest_active(character, quest_id):
     
     Returns: True if active, False otherwise
     """
-    return quest_id in character.get("active_quests", [])
+    return quest_id in character_manager.get_quest_list(character, "active_quests")
     pass
 
 def can_accept_quest(character, quest_id, quest_data_dict):
@@ -210,16 +203,17 @@ def can_accept_quest(character, quest_id, quest_data_dict):
         return False
 
     quest = quest_data_dict[quest_id]
+    completed = character_manager.get_quest_list(character, "completed_quests")
 
     if character["level"] < quest["required_level"]:
         return False
     prereq = quest.get("prerequisite")
     if prereq and prereq != "NONE":
-        if prereq not in character.get("completed_quests", []):
+        if prereq not in completed:
             return False
-    if quest_id in character.get("completed_quests", []):
+    if quest_id in completed:
         return False
-    if quest_id in character.get("active_quests", []):
+    if quest_id in character_manager.get_quest_list(character, "active_quests"):
         return False
 
     return True
@@ -233,23 +227,14 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
-    Raises: QuestNotFoundError if quest doesn't exist
+    Raises:
+        QuestNotFoundError if quest doesn't exist or a prerequisite is missing
+        CircularPrerequisiteError if the chain loops back on itself
     """
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest {quest_id} not found")
 
-    chain = []
-    current_id = quest_id
-
-    while current_id and current_id != "NONE":
-        if current_id not in quest_data_dict:
-            raise QuestNotFoundError(f"Quest {current_id} not found in quest data")
-        
-        chain.insert(0, current_id)  
-        prereq = quest_data_dict[current_id].get("prerequisite")
-        current_id = prereq if prereq and prereq != "NONE" else None
-
-    return chain
+    return get_quest_index(quest_data_dict).prerequisite_chain(quest_id)
     pass
 
 # ============================================================================
@@ -266,7 +251,7 @@ def get_quest_completion_percentage(character, quest_data_dict):
     if total_quests == 0:
         return 0.0
 
-    completed_quests = len(character.get("completed_quests", []))
+    completed_quests = get_quest_stats(character, quest_data_dict)["completed"]
     percentage = (completed_quests / total_quests) * 100
     return float(percentage)
     pass
@@ -277,34 +262,77 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
     
     Returns: Dictionary with 'total_xp' and 'total_gold'
     """
-    total_xp = 0
-    total_gold = 0
+    stats = get_quest_stats(character, quest_data_dict)
+    return {"total_xp": stats["total_xp"], "total_gold": stats["total_gold"]}
+    pass
 
-    for quest_id in character.get("completed_quests", []):
-        if quest_id in quest_data_dict:
-            quest = quest_data_dict[quest_id]
-            total_xp += quest.get("reward_xp", 0)
-            total_gold += quest.get("reward_gold", 0)
+def get_quest_stats(character, quest_data_dict):
+    """
+    Get the running quest aggregates kept on a character's completed quests
+    
+    The aggregates are updated in O(1) by complete_quest. They are rebuilt
+    from scratch only the first time they are needed after the character
+    or the quest data was loaded, or if completed_quests was changed
+    without going through complete_quest.
+    
+    Returns: Dictionary with 'completed', 'total_xp' and 'total_gold'
+    """
+    completed = character_manager.get_quest_list(character, "completed_quests")
+    if not _stats_are_current(completed, quest_data_dict):
+        stats = {
+            "source": quest_data_dict,
+            "version": completed.version,
+            "completed": len(completed),
+            "total_xp": 0,
+            "total_gold": 0,
+        }
+        for quest_id in completed:
+            if quest_id in quest_data_dict:
+                quest = quest_data_dict[quest_id]
+                stats["total_xp"] += quest.get("reward_xp", 0)
+                stats["total_gold"] += quest.get("reward_gold", 0)
+        completed.stats = stats
+    return completed.stats
 
-    return {"total_xp": total_xp, "total_gold": total_gold}
-    pass
+def _record_completion(character, quest_id, quest, quest_data_dict):
+    """
+    Move an active quest to completed_quests and update the running stats
+    
+    The caller has already checked that quest_id is active.
+    """
+    character_manager.get_quest_list(character, "active_quests").remove(quest_id)
+
+    completed = character_manager.get_quest_list(character, "completed_quests")
+    stats = completed.stats
+    stats_current = _stats_are_current(completed, quest_data_dict)
+    completed.append(quest_id)
+    character_manager.mark_dirty(character, "active_quests", "completed_quests")
+    if stats_current:
+        stats["completed"] += 1
+        stats["total_xp"] += quest.get("reward_xp", 0)
+        stats["total_gold"] += quest.get("reward_gold", 0)
+        stats["version"] = completed.version
+
+def _stats_are_current(completed, quest_data_dict):
+    """Check whether completed.stats matches the list and the quest data"""
+    stats = completed.stats
+    return (stats is not None
+            and stats["source"] is quest_data_dict
+            and stats["version"] == completed.version)
 
 def get_quests_by_level(quest_data_dict, min_level, max_level):
     """
     Get all quests within a level range
     
-    Returns: List of quest dictionaries
+    Answered from the sorted level array in the quest index, which a
+    QuestData builds once (and again when the data is reloaded).
+    
+    Returns: List of quest dictionaries, lowest required level first
     """
     if min_level > max_level:
         min_level, max_level = max_level, min_level
 
-    quests_in_range = []
-    for quest_id, quest in quest_data_dict.items():
-        required_level = quest.get("required_level")
-        if required_level is not None and min_level <= required_level <= max_level:
-            quests_in_range.append(quest)
-
-    return quests_in_range
+    return get_quest_index(quest_data_dict).quests_in_level_range(min_level, max_level)
     pass
 
 # ============================================================================
@@ -351,7 +379,7 @@ def display_character_quest_progress(character, quest_data_dict):
     - Total rewards earned
     """
     active_count = len(character.get("active_quests", []))
-    completed_count = len(character.get("completed_quests", []))
+    completed_count = get_quest_stats(character, quest_data_dict)["completed"]
     total_percentage = get_quest_completion_percentage(character, quest_data_dict)
     rewards = get_total_quest_rewards_earned(character, quest_data_dict)
 
@@ -371,20 +399,407 @@ def validate_quest_prerequisites(quest_data_dict):
     Validate that all quest prerequisites exist
     
     Checks that every prerequisite (that's not "NONE") refers to a real quest
+    and that no prerequisite chain loops back on itself
     
     Returns: True if all valid
-    Raises: QuestNotFoundError if invalid prerequisite found
+    Raises:
+        QuestNotFoundError if invalid prerequisite found
+        CircularPrerequisiteError if prerequisites form a cycle
+    """
+    index = get_quest_index(quest_data_dict)
+    for quest_id, prereq in index.missing_prerequisites.items():
+        raise QuestNotFoundError(
+            f"Quest {quest_id} has invalid prerequisite: {prereq}"
+        )
+    if index.cycles:
+        raise CircularPrerequisiteError(_describe_cycle(index.cycles[0]))
+    return True
+    pass
+
+
+# ============================================================================
+# BATCH QUEST OPERATIONS
+# ============================================================================
+
+def accept_quests_bulk(requests, quest_data_dict):
+    """
+    Accept many quests for many characters in one call
+    
+    Args:
+        requests: List of (character, quest_id) pairs
+        quest_data_dict: Dictionary of all quest data
+    
+    Every pair is checked with the same rules as accept_quest against one
+    shared snapshot of the quests involved. A failing pair does not stop
+    the batch.
+    
+    Returns: List with one result dictionary per pair, in order:
+             {"character": name, "quest_id": id, "success": bool, "error": exception or None}
+    """
+    snapshot = _snapshot_quests(requests, quest_data_dict)
+    results = []
+    for character, quest_id in requests:
+        result = _bulk_result(character, quest_id)
+        try:
+            accept_quest(character, quest_id, snapshot)
+            result["success"] = True
+        except GameError as e:
+            result["error"] = e
+        results.append(result)
+    return results
+
+def complete_quests_bulk(requests, quest_data_dict):
+    """
+    Complete many quests for many characters in one call
+    
+    Args:
+        requests: List of (character, quest_id) pairs
+        quest_data_dict: Dictionary of all quest data
+    
+    All pairs are validated first against one shared snapshot of the
+    quests involved (quest exists, quest active, character alive), then
+    the rewards for every valid pair are granted with one call each to
+    character_manager.gain_experience_bulk and add_gold_bulk. A failing
+    pair does not stop the batch and is left unchanged.
+    
+    Returns: List with one result dictionary per pair, in order:
+             {"character": name, "quest_id": id, "success": bool, "error": exception or None,
+              "reward_xp": int, "reward_gold": int}
+    """
+    snapshot = _snapshot_quests(requests, quest_data_dict)
+    results = []
+    rewarded = []
+    for character, quest_id in requests:
+        result = _bulk_result(character, quest_id)
+        results.append(result)
+        try:
+            if quest_id not in snapshot:
+                raise QuestNotFoundError(f"Quest {quest_id} not found")
+            if quest_id not in character_manager.get_quest_list(character, "active_quests"):
+                raise QuestNotActiveError(f"Quest {quest_id} is not active")
+            if character_manager.is_character_dead(character):
+                raise CharacterDeadError(f"{character.get('name', 'Unknown')} is dead")
+        except GameError as e:
+            result["error"] = e
+            continue
+
+        quest = snapshot[quest_id]
+        _record_completion(character, quest_id, quest, quest_data_dict)
+        result["success"] = True
+        result["reward_xp"] = quest["reward_xp"]
+        result["reward_gold"] = quest["reward_gold"]
+        rewarded.append(character)
+
+    rewards = [result for result in results if result["success"]]
+    character_manager.gain_experience_bulk(rewarded, [result["reward_xp"] for result in rewards])
+    character_manager.add_gold_bulk(rewarded, [result["reward_gold"] for result in rewards])
+    return results
+
+def _snapshot_quests(requests, quest_data_dict):
+    """Look up each distinct quest in a batch once"""
+    snapshot = {}
+    for character, quest_id in requests:
+        if quest_id not in snapshot and quest_id in quest_data_dict:
+            snapshot[quest_id] = quest_data_dict[quest_id]
+    return snapshot
+
+def _bulk_result(character, quest_id):
+    """Start the per-pair result dictionary of a batch operation"""
+    return {
+        "character": character.get("name", "Unknown"),
+        "quest_id": quest_id,
+        "success": False,
+        "error": None,
+    }
+
+# ============================================================================
+# QUEST INDEX
+# ============================================================================
+
+class QuestIndex:
     """
-    for quest_id, quest in quest_data_dict.items():
-        prereq = quest.get("prerequisite")
-        if prereq and prereq != "NONE":
-            if prereq not in quest_data_dict:
+    Precomputed lookup structure for quest availability
+    
+    Quests without a prerequisite are kept sorted by required_level, and
+    every other quest is listed under the quest that unlocks it. The quests
+    a character can accept are then found from a frontier: the root quests
+    at or below their level plus the dependents of the quests they
+    completed, instead of checking every quest in the game.
+    
+    All quests are also kept in a sorted array by required_level, so level
+    range queries are answered with bisect in O(log n + results).
+    
+    An index covers one quest dictionary and is not patched afterwards. A
+    data reload swaps in a new QuestData whose prerequisite graph has to
+    be checked in full anyway (see main.load_valid_quests), and that check
+    builds the new data's index once, which later queries reuse.
+    """
+
+    def __init__(self, quest_data_dict):
+        """
+        Build the index
+        
+        Args:
+            quest_data_dict: Dictionary of all quest data
+        """
+        self.quests = quest_data_dict
+        self.position = {}
+        self.dependents = {}
+        self.missing_prerequisites = {}
+        by_level = []
+        roots_by_level = []
+
+        for position, (quest_id, quest) in enumerate(quest_data_dict.items()):
+            self.position[quest_id] = position
+            level = quest.get("required_level")
+            if level is not None:
+                by_level.append((level, position, quest_id))
+            prereq = _get_prerequisite(quest)
+            if prereq is None:
+                if level is not None:
+                    roots_by_level.append((level, position, quest_id))
+            else:
+                self.dependents.setdefault(prereq, []).append(quest_id)
+                if prereq not in quest_data_dict:
+                    self.missing_prerequisites[quest_id] = prereq
+
+        # Parallel sorted arrays: levels[i] is the required_level of level_ids[i]
+        by_level.sort()
+        self.levels = [level for level, position, quest_id in by_level]
+        self.level_ids = [quest_id for level, position, quest_id in by_level]
+        roots_by_level.sort()
+        self.root_levels = [level for level, position, quest_id in roots_by_level]
+        self.root_ids = [quest_id for level, position, quest_id in roots_by_level]
+        self._build_graph()
+
+    def _build_graph(self):
+        """
+        Order the prerequisite graph and find cycles in O(quests)
+        
+        Every quest has at most one prerequisite, so a breadth-first walk
+        down from the quests with no (known) prerequisite visits each
+        acyclic quest exactly once, in topological order, and gives its
+        depth. Quests never reached are on or below a cycle.
+        
+        Sets:
+            topological_order: Quest IDs, every prerequisite before its dependents
+            depth: {quest_id: number of prerequisites before it}
+            broken_by: {quest_id: missing quest ID somewhere up its chain}
+            cycles: List of cycles, each a list of quest IDs
+        """
+        self.topological_order = []
+        self.depth = {}
+        self.broken_by = {}
+        self._chains = {}
+
+        for quest_id, quest in self.quests.items():
+            prereq = _get_prerequisite(quest)
+            if prereq is None or prereq not in self.quests:
+                self.topological_order.append(quest_id)
+                self.depth[quest_id] = 0
+                if prereq is not None:
+                    self.broken_by[quest_id] = prereq
+
+        for quest_id in self.topological_order:
+            for dependent_id in self.dependents.get(quest_id, ()):
+                self.topological_order.append(dependent_id)
+                self.depth[dependent_id] = self.depth[quest_id] + 1
+                if quest_id in self.broken_by:
+                    self.broken_by[dependent_id] = self.broken_by[quest_id]
+
+        self.cycles = []
+        if len(self.topological_order) == len(self.quests):
+            return
+        seen = set(self.depth)
+        for quest_id in self.quests:
+            path = []
+            on_path = {}
+            current = quest_id
+            while current not in seen:
+                seen.add(current)
+                on_path[current] = len(path)
+                path.append(current)
+                current = _get_prerequisite(self.quests[current])
+            if current in on_path:
+                self.cycles.append(path[on_path[current]:])
+
+    def prerequisite_chain(self, quest_id):
+        """
+        Get the prerequisite chain of a quest
+        
+        The chain length is known from the precomputed depth, so it is
+        filled in back to front in output-sized time (no list.insert(0)),
+        and each chain is memoized so repeated lookups are O(1) plus the
+        copy of the result.
+        
+        Returns: List of quest IDs [earliest_prereq, ..., quest_id]
+        Raises:
+            QuestNotFoundError if a prerequisite in the chain is missing
+            CircularPrerequisiteError if the chain loops back on itself
+        """
+        chain = self._chains.get(quest_id)
+        if chain is None:
+            if quest_id in self.broken_by:
                 raise QuestNotFoundError(
-                    f"Quest {quest_id} has invalid prerequisite: {prereq}"
+                    f"Quest {self.broken_by[quest_id]} not found in quest data"
                 )
-    return True
-    pass
+            if quest_id not in self.depth:
+                raise CircularPrerequisiteError(
+                    f"Quest {quest_id} depends on a circular prerequisite chain"
+                )
+            chain = [None] * (self.depth[quest_id] + 1)
+            current = quest_id
+            for position in range(len(chain) - 1, -1, -1):
+                chain[position] = current
+                current = _get_prerequisite(self.quests[current])
+            chain = tuple(chain)
+            self._chains[quest_id] = chain
+        return list(chain)
+
+    def available_quests(self, character):
+        """
+        Get quests the character can accept, in quest data order
+        
+        Returns: List of quest dictionaries
+        """
+        completed = character_manager.get_quest_list(character, "completed_quests")
+        active = character_manager.get_quest_list(character, "active_quests")
+        level = character["level"]
+
+        candidates = self.root_ids[:bisect_right(self.root_levels, level)]
+        for quest_id in completed.distinct():
+            candidates.extend(self.dependents.get(quest_id, ()))
+
+        available = []
+        for quest_id in candidates:
+            if quest_id in completed or quest_id in active:
+                continue
+            if self.quests[quest_id]["required_level"] > level:
+                continue
+            available.append(quest_id)
+
+        available.sort(key=self.position.__getitem__)
+        return [self.quests[quest_id] for quest_id in available]
+
+    def quests_in_level_range(self, min_level, max_level):
+        """
+        Get quests whose required_level is between min_level and max_level
+        
+        Returns: List of quest dictionaries, by level and then quest data order
+        """
+        start = bisect_left(self.levels, min_level)
+        end = bisect_right(self.levels, max_level)
+        return [self.quests[quest_id] for quest_id in self.level_ids[start:end]]
+
+    def unlocked_by(self, character, quest_id):
+        """
+        Get the quests that completing quest_id made available
+        
+        Only the dependents of quest_id are checked.
+        
+        Returns: List of quest dictionaries
+        """
+        completed = character_manager.get_quest_list(character, "completed_quests")
+        active = character_manager.get_quest_list(character, "active_quests")
+        unlocked = []
+        for dependent_id in self.dependents.get(quest_id, ()):
+            if dependent_id in completed or dependent_id in active:
+                continue
+            if self.quests[dependent_id]["required_level"] > character["level"]:
+                continue
+            unlocked.append(self.quests[dependent_id])
+        return unlocked
+
+class QuestData(dict):
+    """
+    Quest dictionary that owns its QuestIndex
+    
+    The index is built the first time it is needed and kept until a quest
+    is added, replaced or removed, which drops it so the next lookup
+    builds it again. The quest records themselves must not be edited in
+    place (the Quest records loaded by game_data are read-only).
+    
+    main wraps loaded and reloaded quest data in a QuestData, so each
+    version of the data is indexed once; a plain dictionary is indexed
+    again on every call (see get_quest_index).
+    """
+    __slots__ = ("_index",)
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._index = None
+
+    @property
+    def index(self):
+        """The QuestIndex of the quests as they are now"""
+        index = self._index
+        if index is None:
+            index = self._index = QuestIndex(self)
+        return index
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._index = None
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._index = None
+
+    def pop(self, key, *default):
+        self._index = None
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._index = None
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._index = None
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._index = None
 
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        dict.clear(self)
+        self._index = None
+
+    def copy(self):
+        return QuestData(self)
+
+    def __reduce__(self):
+        return (QuestData, (dict(self),))
+
+def get_quest_index(quest_data_dict):
+    """
+    Get the QuestIndex for quest_data_dict
+    
+    A QuestData keeps its index between calls. Any other dictionary may
+    have changed since the last call, so it is indexed afresh, which
+    costs one pass over the quests like the scans the index replaced.
+    
+    Returns: QuestIndex
+    """
+    if isinstance(quest_data_dict, QuestData):
+        return quest_data_dict.index
+    return QuestIndex(quest_data_dict)
+
+def _describe_cycle(cycle):
+    """Format a prerequisite cycle as "a -> b -> a" for error messages"""
+    return "Circular quest prerequisites: " + " -> ".join(list(cycle) + [cycle[0]])
+
+def _get_prerequisite(quest):
+    """Return a quest's prerequisite ID, or None if it has none"""
+    prereq = quest.get("prerequisite")
+    if prereq and prereq != "NONE":
+        return prereq
+    return None
 
 # ============================================================================
 # TESTING
@@ -0,0 +1,125 @@
+"""
+Test Character Cache
+Tests for the bounded LRU cache of loaded characters
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterNotFoundError
+
+class FakeClock:
+    """Clock the tests move forward by hand"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def save_party(directory, *names):
+    """Save one character per name and return them"""
+    characters = [character_manager.create_character(name, "Warrior") for name in names]
+    for character in characters:
+        character_manager.save_character(character, directory)
+    return characters
+
+# ============================================================================
+# CACHE TESTS
+# ============================================================================
+
+def test_hot_characters_do_not_read_disk(tmp_path, monkeypatch):
+    """Test that repeated gets are served from the cache"""
+    save_party(str(tmp_path), "Hot")
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path))
+
+    first = cache.get("Hot")
+    monkeypatch.setattr(character_manager, "_read_save", lambda *args: pytest.fail("read from disk"))
+
+    assert cache.get("Hot") == first
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'writebacks': 0, 'size': 1}
+
+def test_least_recently_used_is_evicted_with_write_back(tmp_path):
+    """Test that a dirty entry is saved when it is pushed out"""
+    save_party(str(tmp_path), "A", "B", "C")
+    cache = character_manager.CharacterCache(max_size=2, save_directory=str(tmp_path))
+
+    a = cache.get("A")
+    cache.get("B")
+    character_manager.add_gold(a, 5)
+    cache.put(a)
+    cache.get("C")
+
+    assert "B" not in cache and "A" in cache
+    cache.get("B")
+
+    assert "A" not in cache
+    assert character_manager.load_character("A", str(tmp_path))['gold'] == 105
+    assert cache.stats()['evictions'] == 2 and cache.stats()['writebacks'] == 1
+
+def test_expired_entries_are_reloaded(tmp_path):
+    """Test that entries older than the TTL are loaded again"""
+    save_party(str(tmp_path), "Old")
+    clock = FakeClock()
+    cache = character_manager.CharacterCache(ttl=10, save_directory=str(tmp_path), clock=clock)
+
+    cache.get("Old")
+    clock.now = 5
+    cache.get("Old")
+    clock.now = 11
+    cache.get("Old")
+
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+def test_put_and_clear_write_back_unsaved_characters(tmp_path):
+    """Test write-back of new characters and of a custom save function"""
+    written = []
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path), save=written.append)
+    new = character_manager.create_character("New", "Mage")
+    saved = character_manager.create_character("Saved", "Mage")
+
+    cache.put(new)
+    cache.put(saved, dirty=False)
+    cache.clear()
+
+    assert written == [new] and written[0] is not new
+    assert len(cache) == 0
+    with pytest.raises(CharacterNotFoundError):
+        cache.get("Saved")
+
+def test_cache_keeps_what_was_saved(tmp_path):
+    """Test that later play does not reach the cache or the save on disk"""
+    hero, = save_party(str(tmp_path), "Hero")
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path))
+    cache.put(hero, dirty=False)
+
+    hero['gold'] = 99999
+
+    loaded = cache.get("Hero")
+    assert loaded['gold'] == 100 and loaded is not hero
+    loaded['gold'] = 5
+    assert cache.get("Hero")['gold'] == 100
+    cache.clear()
+    assert character_manager.load_character("Hero", str(tmp_path))['gold'] == 100
+
+def test_miss_loads_outside_the_lock(tmp_path, monkeypatch):
+    """Test that a cache miss does not hold the lock while reading the save"""
+    save_party(str(tmp_path), "Slow")
+    cache = character_manager.CharacterCache(save_directory=str(tmp_path))
+    load = character_manager.load_character
+    held = []
+
+    def checked_load(*args):
+        held.append(cache._lock._is_owned())
+        return load(*args)
+    monkeypatch.setattr(character_manager, "load_character", checked_load)
+
+    cache.get("Slow")
+
+    assert held == [False] and "Slow" in cache
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
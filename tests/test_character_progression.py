@@ -0,0 +1,78 @@
+"""
+Test Character Progression
+Tests for experience and level ups in character_manager
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+def loop_gain_experience(character, xp_amount):
+    """The original one-level-per-iteration definition of gain_experience"""
+    character["experience"] += xp_amount
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+    return character
+
+# ============================================================================
+# LEVEL UP TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("level", [1, 2, 7, 50])
+@pytest.mark.parametrize("xp_amount", [0, 99, 100, 299, 300, 301, 5049, 123456, 10 ** 7])
+def test_closed_form_matches_loop(level, xp_amount):
+    """Test that the single-step level up gives the same character as the loop"""
+    expected = character_manager.create_character("Loop", "Warrior")
+    actual = character_manager.create_character("Loop", "Warrior")
+    for char in (expected, actual):
+        char['level'] = level
+        char['experience'] = 40
+
+    loop_gain_experience(expected, xp_amount)
+    character_manager.gain_experience(actual, xp_amount)
+
+    assert actual == expected
+
+def test_gain_experience_reports_level_ups():
+    """Test the structured report returned by gain_experience"""
+    char = character_manager.create_character("Report", "Mage")
+
+    report = character_manager.gain_experience(char, 350)
+
+    assert report == {
+        'old_level': 1,
+        'new_level': 3,
+        'levels_gained': 2,
+        'experience': 50,
+        'max_health': 20,
+        'strength': 4,
+        'magic': 4,
+    }
+    assert char['level'] == 3 and char['experience'] == 50
+
+def test_gain_experience_bulk_combines_repeated_characters():
+    """Test that repeated grants for one character are applied together"""
+    hero = character_manager.create_character("Hero", "Rogue")
+    other = character_manager.create_character("Other", "Rogue")
+    expected = character_manager.create_character("Hero", "Rogue")
+    for amount in (60, 60, 250):
+        loop_gain_experience(expected, amount)
+
+    reports = character_manager.gain_experience_bulk([hero, other, hero, hero], [60, 10, 60, 250])
+
+    assert hero == expected
+    assert reports[0] is reports[2] is reports[3]
+    assert reports[0]['levels_gained'] == 2
+    assert reports[1]['levels_gained'] == 0 and other['experience'] == 10
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
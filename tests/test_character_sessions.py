@@ -0,0 +1,114 @@
+"""
+Test Character Sessions
+Tests for locking and versioned saves with CharacterSession
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from custom_exceptions import CharacterVersionConflictError
+
+def names_on_different_stripes():
+    """Find two character names guarded by different locks"""
+    first = "Alpha"
+    for i in range(1000):
+        other = f"Beta{i}"
+        if character_manager._lock_stripe(other) != character_manager._lock_stripe(first):
+            return first, other
+
+# ============================================================================
+# LOCKING TESTS
+# ============================================================================
+
+def test_same_character_work_is_serialized():
+    """Test that read-modify-write under a session loses no updates"""
+    char = character_manager.create_character("Shared", "Rogue")
+
+    def spend():
+        for i in range(20):
+            with character_manager.CharacterSession(char):
+                gold = char['gold']
+                time.sleep(0.0005)
+                char['gold'] = gold + 1
+
+    threads = [threading.Thread(target=spend) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert char['gold'] == 180
+
+def test_other_characters_stay_parallel():
+    """Test that a session does not block a character on another lock"""
+    first, second = names_on_different_stripes()
+    a = character_manager.create_character(first, "Mage")
+    b = character_manager.create_character(second, "Mage")
+    entered = threading.Event()
+
+    def other():
+        with character_manager.CharacterSession(b):
+            entered.set()
+
+    with character_manager.CharacterSession(a):
+        thread = threading.Thread(target=other)
+        thread.start()
+        assert entered.wait(2)
+    thread.join()
+
+def test_multi_character_sessions_do_not_deadlock():
+    """Test that sessions over the same pair in either order both finish"""
+    first, second = names_on_different_stripes()
+    a = character_manager.create_character(first, "Cleric")
+    b = character_manager.create_character(second, "Cleric")
+
+    def trade(giver, taker):
+        for i in range(50):
+            with character_manager.CharacterSession(giver, taker):
+                character_manager.add_gold(giver, -1)
+                character_manager.add_gold(taker, 1)
+
+    threads = [threading.Thread(target=trade, args=(a, b)), threading.Thread(target=trade, args=(b, a))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert a['gold'] == b['gold'] == 100
+
+# ============================================================================
+# VERSIONED SAVE TESTS
+# ============================================================================
+
+def test_stale_copy_can_not_overwrite_newer_save(tmp_path):
+    """Test the optimistic version check on save"""
+    char = character_manager.create_character("Versioned", "Warrior")
+    with character_manager.CharacterSession(char, save_directory=str(tmp_path)) as session:
+        session.save()
+
+    first = character_manager.load_character("Versioned", str(tmp_path))
+    second = character_manager.load_character("Versioned", str(tmp_path))
+
+    with character_manager.CharacterSession(first, save_directory=str(tmp_path)) as session:
+        inventory_system.add_item_to_inventory(first, 'health_potion')
+        session.save()
+    with character_manager.CharacterSession(second, save_directory=str(tmp_path)) as session:
+        character_manager.add_gold(second, 50)
+        with pytest.raises(CharacterVersionConflictError):
+            session.save()
+
+    latest = character_manager.load_character("Versioned", str(tmp_path))
+    assert latest['inventory'] == ['health_potion'] and latest['gold'] == 100
+    with character_manager.CharacterSession(latest, save_directory=str(tmp_path)) as session:
+        assert session.save()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,354 @@
+"""
+Test Game Data Loading
+Tests for streaming, caching and content pack loading in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+QUEST_TEXT = (
+    "QUEST_ID: first_quest\n"
+    "TITLE: First Quest\n"
+    "DESCRIPTION: The first one\n"
+    "REWARD_XP: 50\n"
+    "REWARD_GOLD: 25\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: NONE\n"
+    "\n"
+    "\n"
+    "QUEST_ID: second_quest\n"
+    "TITLE: Second Quest\n"
+    "DESCRIPTION: The second one\n"
+    "REWARD_XP: 100\n"
+    "REWARD_GOLD: 50\n"
+    "REQUIRED_LEVEL: 2\n"
+    "PREREQUISITE: first_quest\n"
+)
+
+ITEM_TEXT = (
+    "ITEM_ID: potion\n"
+    "NAME: Potion\n"
+    "TYPE: consumable\n"
+    "EFFECT: health:20\n"
+    "COST: 25\n"
+    "DESCRIPTION: Heals\n"
+)
+
+# ============================================================================
+# STREAMING PARSER TESTS
+# ============================================================================
+
+def test_iter_quests_streams_records_in_order(tmp_path):
+    """Test that iter_quests yields one quest per block in file order"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    quests = list(game_data.iter_quests(str(path)))
+
+    assert [q['quest_id'] for q in quests] == ['first_quest', 'second_quest']
+    assert quests[0]['prerequisite'] is None
+    assert quests[1]['reward_xp'] == 100
+
+def test_iter_items_matches_load_items(tmp_path):
+    """Test that load_items is built from the same records as iter_items"""
+    path = tmp_path / "items.txt"
+    path.write_text(ITEM_TEXT)
+
+    items = game_data.load_items(str(path))
+
+    assert list(items) == ['potion']
+    assert items['potion'] == next(game_data.iter_items(str(path)))
+
+def test_stream_error_reports_line_number(tmp_path):
+    """Test that a bad record reports the line it starts on"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: lots"))
+
+    with pytest.raises(InvalidDataFormatError, match="line 10"):
+        game_data.load_quests(str(path))
+
+def test_iter_quests_missing_file():
+    """Test that streaming a missing file raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        list(game_data.iter_quests("no_such_quests.txt"))
+
+# ============================================================================
+# FIELD SCHEMA TESTS
+# ============================================================================
+
+def test_block_parsers_share_schema():
+    """Test that parsed records contain exactly the schema fields"""
+    quest = game_data.parse_quest_block(QUEST_TEXT.split("\n\n")[0].splitlines())
+    item = game_data.parse_item_block(ITEM_TEXT.splitlines())
+
+    assert list(quest) == game_data.QUEST_FIELDS
+    assert list(item) == game_data.ITEM_FIELDS
+    assert item['effect'] == {'health': 20}
+
+def test_item_block_errors_are_format_errors():
+    """Test that bad item fields raise InvalidDataFormatError"""
+    with pytest.raises(InvalidDataFormatError, match="Missing field: cost"):
+        game_data.parse_item_block(ITEM_TEXT.replace("COST: 25\n", "").splitlines())
+    with pytest.raises(InvalidDataFormatError, match="Invalid item type"):
+        game_data.parse_item_block(ITEM_TEXT.replace("consumable", "food").splitlines())
+    with pytest.raises(InvalidDataFormatError, match="Unexpected field"):
+        game_data.parse_item_block(ITEM_TEXT.replace("COST", "PRICE").splitlines())
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cached_load_reuses_cache(tmp_path, monkeypatch):
+    """Test that an unchanged source is loaded from the compiled cache"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    first = game_data.load_quests_cached(str(path))
+    assert os.path.exists(str(path) + game_data.CACHE_SUFFIX)
+
+    def fail(filename):
+        raise AssertionError("source should not be parsed again")
+    fail.__name__ = "load_quests"
+    monkeypatch.setattr(game_data, "load_quests", fail)
+
+    assert game_data.load_quests_cached(str(path)) == first
+
+def test_cached_load_reparses_changed_source(tmp_path):
+    """Test that editing the source invalidates the compiled cache"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    game_data.load_quests_cached(str(path))
+
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 50", "REWARD_XP: 75"))
+
+    assert game_data.load_quests_cached(str(path))['first_quest']['reward_xp'] == 75
+
+def test_cached_load_ignores_damaged_cache(tmp_path):
+    """Test that a corrupted cache file falls back to parsing"""
+    path = tmp_path / "items.txt"
+    path.write_text(ITEM_TEXT)
+    (tmp_path / ("items.txt" + game_data.CACHE_SUFFIX)).write_bytes(b"not a pickle")
+
+    assert game_data.load_items_cached(str(path)) == game_data.load_items(str(path))
+
+# ============================================================================
+# ITEM CATALOG TESTS
+# ============================================================================
+
+def test_item_catalog_behaves_like_loaded_items():
+    """Test that ItemCatalog answers the same lookups as load_items"""
+    items = game_data.load_items("data/items.txt")
+
+    with game_data.ItemCatalog("data/items.txt") as catalog:
+        assert len(catalog) == len(items)
+        assert list(catalog) == list(items)
+        assert 'iron_sword' in catalog
+        assert 'wooden_spoon' not in catalog
+        assert catalog.get('wooden_spoon') is None
+        assert catalog['iron_sword'] == items['iron_sword']
+        assert dict(catalog.items()) == items
+
+def test_item_catalog_keeps_bounded_cache():
+    """Test that parsed records are held in a bounded LRU"""
+    with game_data.ItemCatalog("data/items.txt", cache_size=2) as catalog:
+        catalog['iron_sword']
+        catalog['steel_sword']
+        catalog['iron_sword']
+        catalog['fire_staff']
+
+        assert list(catalog._records) == ['iron_sword', 'fire_staff']
+
+def test_item_catalog_parses_lazily(tmp_path):
+    """Test that a bad record only fails when it is looked up"""
+    path = tmp_path / "items.txt"
+    path.write_text(ITEM_TEXT + "\n" + ITEM_TEXT.replace("potion", "bad").replace("25", "lots"))
+
+    with game_data.ItemCatalog(str(path)) as catalog:
+        assert catalog['potion']['cost'] == 25
+        with pytest.raises(InvalidDataFormatError):
+            catalog['bad']
+
+# ============================================================================
+# RECORD TYPE TESTS
+# ============================================================================
+
+def test_records_support_mapping_access():
+    """Test that loaded records work like the old quest/item dicts"""
+    quests = game_data.load_quests("data/quests.txt")
+    items = game_data.load_items("data/items.txt")
+
+    quest = quests['goblin_hunter']
+    assert isinstance(quest, game_data.Quest)
+    assert quest['reward_xp'] == 100
+    assert quest.get('prerequisite') == 'first_steps'
+    assert quest.get('effect') is None
+    assert 'title' in quest
+    assert not hasattr(quest, '__dict__')
+
+    item = items['iron_sword']
+    assert item.effect == ('strength', 5)
+    assert item['effect'] == {'strength': 5}
+    assert item == item.to_dict()
+
+def test_records_intern_ids():
+    """Test that IDs and types are interned"""
+    first = game_data.Item.from_dict(game_data.parse_item_block(ITEM_TEXT.splitlines()))
+    second = game_data.Item.from_dict(game_data.parse_item_block(ITEM_TEXT.splitlines()))
+
+    assert first.item_id is second.item_id
+    assert first.type is second.type
+
+# ============================================================================
+# CONTENT PACK TESTS
+# ============================================================================
+
+def write_pack(directory):
+    """Write a small content pack with one duplicated quest ID"""
+    blocks = QUEST_TEXT.split("\n\n\n")
+    (directory / "quests_a.txt").write_text(blocks[0])
+    (directory / "quests_b.txt").write_text(blocks[1] + "\n\n" + blocks[0])
+    (directory / "items_a.txt").write_text(ITEM_TEXT)
+
+def test_content_pack_merges_shards(tmp_path):
+    """Test that shards are merged with deterministic conflict reporting"""
+    write_pack(tmp_path)
+
+    pack = game_data.load_content_pack(str(tmp_path), workers=2)
+
+    assert list(pack['quests']) == ['first_quest', 'second_quest']
+    assert list(pack['items']) == ['potion']
+    assert pack['conflicts'] == [{
+        'kind': 'quests',
+        'id': 'first_quest',
+        'shard': 'quests_b.txt',
+        'first_shard': 'quests_a.txt',
+    }]
+    assert game_data.load_content_pack(str(tmp_path), workers=1) == pack
+
+def test_content_pack_reports_bad_shard(tmp_path):
+    """Test that a bad shard raises with its name and line number"""
+    write_pack(tmp_path)
+    (tmp_path / "items_b.txt").write_text("\n" + ITEM_TEXT.replace("COST: 25", "COST: free"))
+
+    with pytest.raises(InvalidDataFormatError, match=r"items_b\.txt, line 2"):
+        game_data.load_content_pack(str(tmp_path), workers=2)
+
+def test_content_pack_missing_directory(tmp_path):
+    """Test that an empty or missing pack raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_content_pack(str(tmp_path / "nope"))
+    with pytest.raises(MissingDataFileError):
+        game_data.load_content_pack(str(tmp_path))
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_watcher_reloads_changed_file_with_diff(tmp_path):
+    """Test that only changed files are reloaded and subscribers get a diff"""
+    quests_file = tmp_path / "quests.txt"
+    items_file = tmp_path / "items.txt"
+    quests_file.write_text(QUEST_TEXT)
+    items_file.write_text(ITEM_TEXT)
+
+    watcher = game_data.DataWatcher(str(quests_file), str(items_file),
+                                    game_data.load_quests, game_data.load_items)
+    quests, items = watcher.load()
+    seen = []
+    watcher.subscribe(lambda kind, diff, data: seen.append((kind, diff, data)))
+
+    assert watcher.poll() == {}
+
+    first_block = QUEST_TEXT.split("\n\n\n")[0]
+    quests_file.write_text(first_block.replace("REWARD_XP: 50", "REWARD_XP: 60")
+                           + "\n\n" + first_block.replace("first_quest", "third_quest"))
+    os.utime(quests_file, ns=(1, 1))
+
+    reloaded = watcher.poll()
+
+    assert list(reloaded) == ['quests']
+    diff = reloaded['quests']
+    assert list(diff['added']) == ['third_quest']
+    assert list(diff['removed']) == ['second_quest']
+    old, new = diff['changed']['first_quest']
+    assert (old['reward_xp'], new['reward_xp']) == (50, 60)
+    assert seen == [('quests', diff, watcher.data['quests'])]
+    assert watcher.data['quests'] is not quests
+    assert watcher.data['items'] is items
+
+def test_watcher_keeps_data_when_reload_fails(tmp_path):
+    """Test that a broken edit leaves the loaded data in place"""
+    quests_file = tmp_path / "quests.txt"
+    items_file = tmp_path / "items.txt"
+    quests_file.write_text(QUEST_TEXT)
+    items_file.write_text(ITEM_TEXT)
+    watcher = game_data.DataWatcher(str(quests_file), str(items_file),
+                                    game_data.load_quests, game_data.load_items)
+    quests, items = watcher.load()
+
+    quests_file.write_text("broken")
+    os.utime(quests_file, ns=(1, 1))
+
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert watcher.data['quests'] is quests
+
+def test_watcher_reports_files_that_reloaded_before_an_error(tmp_path):
+    """Test that a broken file does not hide another file's reload"""
+    quests_file = tmp_path / "quests.txt"
+    items_file = tmp_path / "items.txt"
+    quests_file.write_text(QUEST_TEXT)
+    items_file.write_text(ITEM_TEXT)
+    watcher = game_data.DataWatcher(str(quests_file), str(items_file),
+                                    game_data.load_quests, game_data.load_items)
+    watcher.load()
+    seen = []
+    watcher.subscribe(lambda kind, diff, data: seen.append((kind, list(data))))
+
+    quests_file.write_text(QUEST_TEXT.split("\n\n\n")[1])
+    items_file.write_text(ITEM_TEXT.replace("COST: 25", "COST: free"))
+    os.utime(quests_file, ns=(1, 1))
+    os.utime(items_file, ns=(1, 1))
+
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert seen == [('quests', ['second_quest'])]
+
+    items_file.write_text(ITEM_TEXT)
+    os.utime(items_file, ns=(2, 2))
+
+    assert list(watcher.poll()) == ['items']
+    assert [kind for kind, names in seen] == ['quests', 'items']
+
+def test_watcher_runs_every_subscriber(tmp_path):
+    """Test that a failing subscriber does not skip the others"""
+    quests_file = tmp_path / "quests.txt"
+    items_file = tmp_path / "items.txt"
+    quests_file.write_text(QUEST_TEXT)
+    items_file.write_text(ITEM_TEXT)
+    watcher = game_data.DataWatcher(str(quests_file), str(items_file),
+                                    game_data.load_quests, game_data.load_items)
+    watcher.load()
+    seen = []
+
+    def failing(kind, diff, data):
+        raise RuntimeError("subscriber failed")
+    watcher.subscribe(failing)
+    watcher.subscribe(lambda kind, diff, data: seen.append(kind))
+
+    os.utime(quests_file, ns=(1, 1))
+    os.utime(items_file, ns=(1, 1))
+
+    with pytest.raises(RuntimeError):
+        watcher.poll()
+    assert seen == ['quests', 'items']
+    assert watcher.poll() == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""
+Test Inventory
+Tests for the count-based inventory in character_manager and inventory_system
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from custom_exceptions import InventoryFullError, ItemNotFoundError
+
+# ============================================================================
+# INVENTORY TYPE TESTS
+# ============================================================================
+
+def test_inventory_keeps_counts_and_size():
+    """Test counts, total size and grouped iteration order"""
+    inventory = character_manager.Inventory(["potion", "sword", "potion"])
+
+    assert len(inventory) == 3
+    assert inventory.count("potion") == 2
+    assert inventory.count("shield") == 0
+    assert "sword" in inventory and "shield" not in inventory
+    assert list(inventory) == ["potion", "potion", "sword"]
+    assert dict(inventory.items()) == {"potion": 2, "sword": 1}
+
+    inventory.remove("potion")
+    inventory.remove("sword")
+
+    assert list(inventory) == ["potion"]
+    assert "sword" not in inventory and len(inventory) == 1
+    with pytest.raises(ValueError):
+        inventory.remove("sword")
+
+def test_inventory_indexing_and_equality():
+    """Test list-style indexing and order-insensitive comparison"""
+    inventory = character_manager.Inventory(["a", "b", "a", "c"])
+
+    assert [inventory[i] for i in range(len(inventory))] == ["a", "a", "b", "c"]
+    assert inventory[-1] == "c"
+    assert inventory[1:3] == ["a", "b"]
+    with pytest.raises(IndexError):
+        inventory[4]
+    assert inventory == ["c", "a", "b", "a"]
+    assert inventory != ["a", "b", "c"]
+    assert inventory == inventory.copy()
+
+# ============================================================================
+# INVENTORY SYSTEM TESTS
+# ============================================================================
+
+def test_plain_list_is_converted_once():
+    """Test that a hand-built character's list inventory becomes an Inventory"""
+    char = {'inventory': ['health_potion', 'health_potion'], 'gold': 0}
+
+    assert inventory_system.count_item(char, 'health_potion') == 2
+    inventory = char['inventory']
+    assert isinstance(inventory, character_manager.Inventory)
+
+    inventory_system.add_item_to_inventory(char, 'iron_sword')
+
+    assert char['inventory'] is inventory
+    assert inventory_system.get_inventory_space_remaining(char) == inventory_system.MAX_INVENTORY_SIZE - 3
+
+def test_inventory_limits_and_removal():
+    """Test the size limit and removal through inventory_system"""
+    char = character_manager.create_character("Packer", "Rogue")
+    for _ in range(inventory_system.MAX_INVENTORY_SIZE):
+        inventory_system.add_item_to_inventory(char, 'health_potion')
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, 'iron_sword')
+
+    inventory_system.remove_item_from_inventory(char, 'health_potion')
+    assert inventory_system.count_item(char, 'health_potion') == inventory_system.MAX_INVENTORY_SIZE - 1
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.remove_item_from_inventory(char, 'iron_sword')
+    assert inventory_system.clear_inventory(char) == ['health_potion'] * 19
+    assert not inventory_system.has_item(char, 'health_potion')
+
+# ============================================================================
+# SAVE FORMAT TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_inventory_round_trips_through_saves(tmp_path, binary):
+    """Test that the inventory still saves as a list and loads as an Inventory"""
+    char = character_manager.create_character("Hoarder", "Warrior")
+    for item_id in ['health_potion', 'iron_sword', 'health_potion']:
+        inventory_system.add_item_to_inventory(char, item_id)
+
+    assert "Inventory: health_potion,health_potion,iron_sword\n" in character_manager._format_save(char)
+
+    previous = character_manager.set_binary_saves(binary)
+    try:
+        character_manager.save_character(char, str(tmp_path))
+    finally:
+        character_manager.set_binary_saves(previous)
+    loaded = character_manager.load_character("Hoarder", str(tmp_path))
+
+    assert isinstance(loaded['inventory'], character_manager.Inventory)
+    assert loaded['inventory'].count('health_potion') == 2
+    assert loaded == char
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
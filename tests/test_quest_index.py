@@ -0,0 +1,202 @@
+"""
+Test Quest Index
+Tests for the precomputed quest lookups in quest_handler
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+import game_data
+from custom_exceptions import QuestNotFoundError, CircularPrerequisiteError
+
+def make_quests(count=60):
+    """Generate quests in several prerequisite chains with varied levels"""
+    quests = {}
+    for i in range(count):
+        quests[f"q{i}"] = {
+            'quest_id': f"q{i}",
+            'title': f"Quest {i}",
+            'description': 'Generated',
+            'reward_xp': 10 * i,
+            'reward_gold': 5 * i,
+            'required_level': 1 + (i * 7) % 10,
+            'prerequisite': 'NONE' if i < 5 else f"q{i - 5}",
+        }
+    return quests
+
+def brute_force_available(character, quests):
+    """The original full-scan definition of an available quest"""
+    available = []
+    for quest_id, quest in quests.items():
+        if quest_id in character['completed_quests'] or quest_id in character['active_quests']:
+            continue
+        if character['level'] < quest['required_level']:
+            continue
+        prereq = quest.get('prerequisite')
+        if prereq and prereq != 'NONE' and prereq not in character['completed_quests']:
+            continue
+        available.append(quest)
+    return available
+
+# ============================================================================
+# AVAILABILITY INDEX TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("level", [1, 4, 10])
+def test_available_quests_match_full_scan(level):
+    """Test that the frontier gives the same result as scanning every quest"""
+    quests = make_quests()
+    char = {
+        'level': level,
+        'completed_quests': ['q0', 'q1', 'q5', 'q2', 'q10'],
+        'active_quests': ['q3'],
+    }
+
+    assert quest_handler.get_available_quests(char, quests) == brute_force_available(char, quests)
+
+def test_quest_data_owns_its_index():
+    """Test that QuestData keeps its index until a quest is changed"""
+    quests = quest_handler.QuestData(make_quests())
+    index = quest_handler.get_quest_index(quests)
+
+    assert quest_handler.get_quest_index(quests) is index
+
+    quests['extra'] = dict(quests['q0'], quest_id='extra')
+    assert quest_handler.get_quest_index(quests) is not index
+    assert 'extra' in quest_handler.get_quest_index(quests).position
+    del quests['extra']
+    assert 'extra' not in quest_handler.get_quest_index(quests).position
+
+def test_plain_dicts_see_in_place_edits():
+    """Test edits that keep the number of quests the same"""
+    quests = {
+        'a': {'quest_id': 'a', 'required_level': 1, 'prerequisite': 'NONE'},
+        'b': {'quest_id': 'b', 'required_level': 2, 'prerequisite': 'NONE'},
+    }
+    char = {'level': 3, 'completed_quests': [], 'active_quests': []}
+    assert len(quest_handler.get_quests_by_level(quests, 1, 3)) == 2
+
+    quests['a']['required_level'] = 9
+    del quests['b']
+    quests['c'] = {'quest_id': 'c', 'required_level': 1, 'prerequisite': 'NONE'}
+
+    assert [q['quest_id'] for q in quest_handler.get_quests_by_level(quests, 1, 3)] == ['c']
+    assert quest_handler.get_available_quests(char, quests) == brute_force_available(char, quests)
+    del quests['a']
+    assert quest_handler.get_available_quests(char, quests) == brute_force_available(char, quests)
+
+def test_unlocked_by_only_returns_dependents():
+    """Test that completing a quest reports the quests it unlocked"""
+    quests = make_quests()
+    char = {'level': 10, 'completed_quests': ['q0'], 'active_quests': []}
+    index = quest_handler.get_quest_index(quests)
+
+    unlocked = index.unlocked_by(char, 'q0')
+
+    assert [quest['quest_id'] for quest in unlocked] == ['q5']
+
+def test_index_on_loaded_quests():
+    """Test the index against the shipped quest file"""
+    quests = game_data.load_quests("data/quests.txt")
+    char = {'level': 3, 'completed_quests': ['first_steps'], 'active_quests': []}
+
+    available = quest_handler.get_available_quests(char, quests)
+
+    assert [quest['quest_id'] for quest in available] == ['goblin_hunter', 'equipment_upgrade']
+
+# ============================================================================
+# LEVEL RANGE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("min_level, max_level", [(1, 1), (3, 7), (7, 3), (0, 100), (11, 20)])
+def test_quests_by_level_match_full_scan(min_level, max_level):
+    """Test bisect range queries against a scan of every quest"""
+    quests = make_quests()
+    low, high = sorted([min_level, max_level])
+    expected = [quest for quest in quests.values() if low <= quest['required_level'] <= high]
+
+    result = quest_handler.get_quests_by_level(quests, min_level, max_level)
+
+    assert sorted(q['quest_id'] for q in result) == sorted(q['quest_id'] for q in expected)
+    levels = [quest['required_level'] for quest in result]
+    assert levels == sorted(levels)
+
+def test_level_ranges_follow_data_reloads(tmp_path):
+    """Test range queries on old and reloaded quest data during a reload"""
+    quests_file = tmp_path / "quests.txt"
+    items_file = tmp_path / "items.txt"
+    quests_file.write_text(open("data/quests.txt").read())
+    items_file.write_text(open("data/items.txt").read())
+
+    def load_valid_quests(filename):
+        quests = quest_handler.QuestData(game_data.load_quests(filename))
+        quest_handler.validate_quest_prerequisites(quests)
+        return quests
+    watcher = game_data.DataWatcher(str(quests_file), str(items_file),
+                                    load_valid_quests, game_data.load_items)
+    old, items = watcher.load()
+    before = quest_handler.get_quests_by_level(old, 1, 1)
+
+    quests_file.write_text(quests_file.read_text().replace("REQUIRED_LEVEL: 1\n", "REQUIRED_LEVEL: 2\n"))
+    os.utime(quests_file, ns=(1, 1))
+    watcher.poll()
+    new = watcher.data['quests']
+
+    assert quest_handler.get_quests_by_level(old, 1, 1) == before != []
+    assert quest_handler.get_quests_by_level(new, 1, 1) == []
+    assert quest_handler.get_quest_index(new) is quest_handler.get_quest_index(new)
+
+# ============================================================================
+# DEPENDENCY GRAPH TESTS
+# ============================================================================
+
+def test_prerequisite_chain_and_depth():
+    """Test chains and depths computed from the dependency graph"""
+    quests = make_quests()
+    index = quest_handler.get_quest_index(quests)
+
+    assert quest_handler.get_quest_prerequisite_chain('q12', quests) == ['q2', 'q7', 'q12']
+    assert index.depth['q12'] == 2
+    order = index.topological_order
+    assert sorted(order) == sorted(quests)
+    assert all(order.index(f"q{i - 5}") < order.index(f"q{i}") for i in range(5, 60))
+
+def test_long_chain_is_linear():
+    """Test a deep chain without recursion or quadratic inserts"""
+    quests = {}
+    for i in range(20000):
+        quests[f"c{i}"] = {'required_level': 1, 'prerequisite': f"c{i - 1}" if i else 'NONE'}
+
+    chain = quest_handler.get_quest_prerequisite_chain('c19999', quests)
+
+    assert len(chain) == 20000 and chain[0] == 'c0'
+    assert quest_handler.validate_quest_prerequisites(quests)
+
+def test_cycle_is_reported():
+    """Test that cyclic prerequisites raise instead of looping forever"""
+    quests = make_quests(10)
+    quests['q0']['prerequisite'] = 'q5'
+    quests['q9']['prerequisite'] = 'q0'
+
+    with pytest.raises(CircularPrerequisiteError, match="q0 -> q5 -> q0"):
+        quest_handler.validate_quest_prerequisites(quests)
+    with pytest.raises(CircularPrerequisiteError):
+        quest_handler.get_quest_prerequisite_chain('q9', quests)
+    assert quest_handler.get_quest_prerequisite_chain('q6', quests) == ['q1', 'q6']
+
+def test_missing_prerequisite_is_reported():
+    """Test that a missing prerequisite is still a QuestNotFoundError"""
+    quests = make_quests(10)
+    quests['q1']['prerequisite'] = 'ghost'
+
+    with pytest.raises(QuestNotFoundError, match="ghost"):
+        quest_handler.validate_quest_prerequisites(quests)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('q6', quests)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,189 @@
+"""
+Test Quest State
+Tests for the quest state kept on characters
+"""
+
+import pickle
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_handler
+from character_manager import QuestList
+from custom_exceptions import (
+    QuestNotFoundError,
+    QuestNotActiveError,
+    QuestRequirementsNotMetError,
+    CharacterDeadError
+)
+
+QUESTS = {
+    'first_quest': {
+        'quest_id': 'first_quest',
+        'title': 'First Quest',
+        'description': 'A test',
+        'reward_xp': 50,
+        'reward_gold': 25,
+        'required_level': 1,
+        'prerequisite': 'NONE'
+    },
+    'second_quest': {
+        'quest_id': 'second_quest',
+        'title': 'Second Quest',
+        'description': 'Another test',
+        'reward_xp': 75,
+        'reward_gold': 40,
+        'required_level': 1,
+        'prerequisite': 'first_quest'
+    }
+}
+
+# ============================================================================
+# QUEST LIST TESTS
+# ============================================================================
+
+def test_quest_list_mirrors_list_operations():
+    """Test that membership stays correct through list mutations"""
+    quests = QuestList(['a', 'b', 'a'])
+
+    quests.remove('a')
+    assert 'a' in quests
+    quests.pop()
+    assert 'a' not in quests
+    quests += ['c']
+    quests.insert(0, 'd')
+    quests[1] = 'e'
+    assert list(quests) == ['d', 'e', 'c']
+    assert 'b' not in quests and 'e' in quests
+    del quests[0]
+    assert 'd' not in quests
+    quests.clear()
+    assert 'c' not in quests and quests == []
+
+def test_quest_list_survives_pickle_and_copy():
+    """Test that copies keep their membership mirror"""
+    quests = QuestList(['a', 'b'])
+
+    for copy in [pickle.loads(pickle.dumps(quests)), quests.copy()]:
+        assert isinstance(copy, QuestList)
+        assert copy == ['a', 'b'] and 'b' in copy
+
+def test_characters_use_quest_lists_and_save_as_lists(tmp_path):
+    """Test that created and loaded characters carry QuestLists"""
+    char = character_manager.create_character("QuestListTest", "Mage")
+    assert isinstance(char['completed_quests'], QuestList)
+
+    quest_handler.accept_quest(char, 'first_quest', QUESTS)
+    quest_handler.complete_quest(char, 'first_quest', QUESTS)
+    quest_handler.accept_quest(char, 'second_quest', QUESTS)
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("QuestListTest", str(tmp_path))
+
+    assert isinstance(loaded['active_quests'], QuestList)
+    assert loaded['completed_quests'] == ['first_quest']
+    assert quest_handler.is_quest_active(loaded, 'second_quest')
+
+def test_plain_lists_are_upgraded():
+    """Test that hand-built characters get QuestLists on first use"""
+    char = {'level': 1, 'active_quests': [], 'completed_quests': ['first_quest']}
+
+    assert quest_handler.can_accept_quest(char, 'second_quest', QUESTS)
+    assert isinstance(char['completed_quests'], QuestList)
+
+# ============================================================================
+# QUEST STATISTICS TESTS
+# ============================================================================
+
+def test_stats_update_incrementally():
+    """Test that complete_quest keeps the aggregates up to date"""
+    char = character_manager.create_character("StatsTest", "Rogue")
+    stats = quest_handler.get_quest_stats(char, QUESTS)
+    assert (stats['completed'], stats['total_xp'], stats['total_gold']) == (0, 0, 0)
+
+    quest_handler.accept_quest(char, 'first_quest', QUESTS)
+    quest_handler.complete_quest(char, 'first_quest', QUESTS)
+
+    assert char['completed_quests'].stats is stats
+    assert (stats['completed'], stats['total_xp'], stats['total_gold']) == (1, 50, 25)
+    assert quest_handler.get_total_quest_rewards_earned(char, QUESTS) == {'total_xp': 50, 'total_gold': 25}
+    assert quest_handler.get_quest_completion_percentage(char, QUESTS) == 50.0
+
+def test_stats_rebuild_after_outside_change():
+    """Test that direct list edits and new quest data trigger a rebuild"""
+    char = character_manager.create_character("StatsTest", "Rogue")
+    quest_handler.get_quest_stats(char, QUESTS)
+
+    char['completed_quests'].append('second_quest')
+    assert quest_handler.get_total_quest_rewards_earned(char, QUESTS)['total_xp'] == 75
+
+    reloaded = {quest_id: dict(quest, reward_xp=1) for quest_id, quest in QUESTS.items()}
+    assert quest_handler.get_total_quest_rewards_earned(char, reloaded)['total_xp'] == 1
+
+# ============================================================================
+# BULK OPERATION TESTS
+# ============================================================================
+
+def test_accept_quests_bulk_reports_each_pair():
+    """Test that one bad pair does not stop the rest of the batch"""
+    heroes = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(3)]
+    pairs = [(hero, 'first_quest') for hero in heroes] + [(heroes[0], 'second_quest'), (heroes[1], 'ghost')]
+
+    results = quest_handler.accept_quests_bulk(pairs, QUESTS)
+
+    assert [result['success'] for result in results] == [True, True, True, False, False]
+    assert isinstance(results[3]['error'], QuestRequirementsNotMetError)
+    assert isinstance(results[4]['error'], QuestNotFoundError)
+    assert all(hero['active_quests'] == ['first_quest'] for hero in heroes)
+
+def test_complete_quests_bulk_matches_single_calls():
+    """Test that batched completion gives the same characters as complete_quest"""
+    batch = [character_manager.create_character(f"Hero{i}", "Mage") for i in range(50)]
+    single = [character_manager.create_character(f"Hero{i}", "Mage") for i in range(50)]
+    for hero in batch + single:
+        quest_handler.accept_quest(hero, 'first_quest', QUESTS)
+
+    results = quest_handler.complete_quests_bulk([(hero, 'first_quest') for hero in batch], QUESTS)
+    for hero in single:
+        quest_handler.complete_quest(hero, 'first_quest', QUESTS)
+
+    assert all(result['success'] and result['reward_xp'] == 50 for result in results)
+    assert batch == single
+    assert quest_handler.get_quest_stats(batch[0], QUESTS)['total_gold'] == 25
+
+def test_complete_quests_bulk_skips_invalid_pairs():
+    """Test that inactive quests and dead characters are left unchanged"""
+    alive = character_manager.create_character("Alive", "Cleric")
+    dead = character_manager.create_character("Dead", "Cleric")
+    for hero in (alive, dead):
+        quest_handler.accept_quest(hero, 'first_quest', QUESTS)
+    dead['health'] = 0
+
+    results = quest_handler.complete_quests_bulk(
+        [(alive, 'first_quest'), (alive, 'first_quest'), (dead, 'first_quest')], QUESTS)
+
+    assert [result['success'] for result in results] == [True, False, False]
+    assert isinstance(results[1]['error'], QuestNotActiveError)
+    assert isinstance(results[2]['error'], CharacterDeadError)
+    assert alive['gold'] == 125 and alive['completed_quests'] == ['first_quest']
+    assert dead['active_quests'] == ['first_quest'] and dead['gold'] == 100
+
+def test_reward_bulk_helpers_return_per_item_results():
+    """Test the batched gain_experience and add_gold helpers"""
+    hero = character_manager.create_character("Hero", "Rogue")
+    ghost = character_manager.create_character("Ghost", "Rogue")
+    ghost['health'] = 0
+
+    xp_results = character_manager.gain_experience_bulk([hero, ghost], [150, 10])
+    gold_results = character_manager.add_gold_bulk([hero, hero], [-500, 5])
+
+    assert xp_results[0]['levels_gained'] == 1 and hero['level'] == 2
+    assert isinstance(xp_results[1], CharacterDeadError)
+    assert isinstance(gold_results[0], ValueError)
+    assert gold_results[1] == 105
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,707 @@
+"""
+Test Save Files
+Tests for writing and reading character saves in character_manager
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+LEGACY_SAVE = (
+    "Name: SaveTest\n"
+    "Class: Warrior\n"
+    "Level: 1\n"
+    "Health: 150\n"
+    "Max_Health: 150\n"
+    "Strength: 20\n"
+    "Magic: 5\n"
+    "Experience: 0\n"
+    "Gold: 100\n"
+    "Inventory: health_potion,iron_sword\n"
+    "Active_Quests: first_steps\n"
+    "Completed_Quests: \n"
+)
+
+def make_character(name="SaveTest"):
+    """Create a character with a little inventory and quest state"""
+    char = character_manager.create_character(name, "Warrior")
+    char['inventory'] = ['health_potion', 'iron_sword']
+    char['active_quests'].append('first_steps')
+    return char
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_save_format_is_unchanged(tmp_path):
+    """Test that the single-buffer save writes the same text as before"""
+    character_manager.save_character(make_character(), str(tmp_path))
+
+    assert (tmp_path / "SaveTest_save.txt").read_text() == LEGACY_SAVE
+    assert os.listdir(tmp_path) == ["SaveTest_save.txt"]
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that a save interrupted before the rename leaves the old save"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path))
+    char['gold'] = 999
+
+    def crash(src, dst):
+        raise IOError("disk unplugged")
+    monkeypatch.setattr(os, "replace", crash)
+
+    with pytest.raises(IOError):
+        character_manager.save_character(char, str(tmp_path))
+
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 100
+    assert os.listdir(tmp_path) == ["SaveTest_save.txt"]
+
+def test_batched_saves_sync_once(tmp_path, monkeypatch):
+    """Test that saves in a batch are published together after one sync each"""
+    syncs = []
+    monkeypatch.setattr(os, "sync", lambda: pytest.fail("synced every filesystem"), raising=False)
+    monkeypatch.setattr(os, "fsync", lambda fd: syncs.append("directory"))
+    monkeypatch.setattr(os, "fdatasync", lambda fd: syncs.append("file"), raising=False)
+    first = make_character("First")
+    second = make_character("Second")
+    character_manager.save_character(first, str(tmp_path))
+    syncs.clear()
+
+    with character_manager.batched_saves():
+        first['gold'] = 1
+        character_manager.save_character(first, str(tmp_path))
+        first['gold'] = 2
+        character_manager.save_character(first, str(tmp_path))
+        character_manager.save_character(second, str(tmp_path))
+        assert character_manager.load_character("First", str(tmp_path))['gold'] == 100
+
+    assert sorted(syncs) == ["directory", "file", "file"]
+    assert character_manager.load_character("First", str(tmp_path))['gold'] == 2
+    assert sorted(os.listdir(tmp_path)) == ["First_save.txt", "Second_save.txt"]
+
+def test_saves_keep_file_permissions(tmp_path):
+    """Test that new saves get the usual mode and rewrites keep theirs"""
+    char = make_character()
+    path = tmp_path / "SaveTest_save.txt"
+    character_manager.save_character(char, str(tmp_path))
+    probe = tmp_path / "probe.txt"
+    probe.write_text("")
+
+    assert path.stat().st_mode & 0o777 == probe.stat().st_mode & 0o777
+    os.chmod(path, 0o640)
+    character_manager.save_character(char, str(tmp_path))
+    assert path.stat().st_mode & 0o777 == 0o640
+
+def test_batched_saves_discarded_on_error(tmp_path):
+    """Test that an exception inside a batch publishes nothing"""
+    with pytest.raises(RuntimeError):
+        with character_manager.batched_saves():
+            character_manager.save_character(make_character(), str(tmp_path))
+            raise RuntimeError("abort")
+
+    assert os.listdir(tmp_path) == []
+
+# ============================================================================
+# SHARDED LAYOUT TESTS
+# ============================================================================
+
+def test_migrate_flat_saves_moves_into_shards(tmp_path):
+    """Test that migration keeps every save loadable and listed"""
+    for name in ("Ann", "Bob", "Cy"):
+        character_manager.save_character(make_character(name), str(tmp_path))
+
+    assert character_manager.migrate_flat_saves(str(tmp_path)) == 3
+
+    assert not any(f.endswith("_save.txt") for f in os.listdir(tmp_path))
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["Ann", "Bob", "Cy"]
+    assert character_manager.load_character("Bob", str(tmp_path))['name'] == "Bob"
+    assert character_manager.migrate_flat_saves(str(tmp_path)) == 0
+
+def test_sharded_directory_uses_index(tmp_path, monkeypatch):
+    """Test saving, paging and deleting in a sharded directory"""
+    character_manager.migrate_flat_saves(str(tmp_path))
+    for i in range(10):
+        character_manager.save_character(make_character(f"Hero{i}"), str(tmp_path))
+    character_manager.save_character(make_character("Hero3"), str(tmp_path))
+    character_manager.delete_character("Hero5", str(tmp_path))
+
+    def no_listing(path):
+        raise AssertionError("sharded listing should not scan the directory")
+    monkeypatch.setattr(os, "listdir", no_listing)
+
+    names = character_manager.list_saved_characters(str(tmp_path))
+    assert names == [f"Hero{i}" for i in range(10) if i != 5]
+    assert character_manager.list_saved_characters(str(tmp_path), offset=2, limit=3) == ["Hero2", "Hero3", "Hero4"]
+    with pytest.raises(character_manager.CharacterNotFoundError):
+        character_manager.load_character("Hero5", str(tmp_path))
+
+def test_partly_migrated_saves_still_load(tmp_path):
+    """Test the flat-path fallback for saves a migration has not moved"""
+    character_manager.migrate_flat_saves(str(tmp_path))
+    (tmp_path / "Old_save.txt").write_text(LEGACY_SAVE.replace("SaveTest", "Old"))
+
+    assert character_manager.load_character("Old", str(tmp_path))['name'] == "Old"
+    assert character_manager.delete_character("Old", str(tmp_path))
+
+def test_rerun_migration_keeps_newer_shard_save(tmp_path):
+    """Test that a stale flat save never replaces a newer shard save"""
+    character_manager.save_character(make_character("Late"), str(tmp_path))
+    character_manager.save_character(make_character("Keep"), str(tmp_path))
+    character_manager._write_index(str(tmp_path), ["Late", "Keep"])
+    late = make_character("Late")
+    late['gold'] = 777
+    character_manager.save_character(late, str(tmp_path))
+
+    assert not (tmp_path / "Late_save.txt").exists()
+    (tmp_path / "Late_save.txt").write_text(LEGACY_SAVE.replace("SaveTest", "Late"))
+    assert character_manager.migrate_flat_saves(str(tmp_path)) == 1
+
+    assert character_manager.load_character("Late", str(tmp_path))['gold'] == 777
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(os.path.dirname(character_manager._save_path(name, str(tmp_path), True)))
+        for name in ("Late", "Keep")) + [character_manager.SAVE_INDEX]
+
+def test_paging_replays_only_new_index_entries(tmp_path, monkeypatch):
+    """Test that listing a page does not replay the whole index"""
+    character_manager.migrate_flat_saves(str(tmp_path))
+    for i in range(50):
+        character_manager.save_character(make_character(f"Page{i}"), str(tmp_path))
+    character_manager.list_saved_characters(str(tmp_path))
+    character_manager.save_character(make_character("Page50"), str(tmp_path))
+
+    replayed = []
+    replay = character_manager._IndexCheckpoint.replay
+    monkeypatch.setattr(character_manager._IndexCheckpoint, "replay",
+                        lambda self, text: replayed.append(text) or replay(self, text))
+
+    assert character_manager.list_saved_characters(str(tmp_path), offset=48, limit=5) == [
+        "Page48", "Page49", "Page50"]
+    assert character_manager.list_saved_characters(str(tmp_path), offset=0, limit=1) == ["Page0"]
+    assert replayed == ["+Page50\n"]
+
+def test_index_is_compacted(tmp_path):
+    """Test that deleted entries are dropped from the index on read"""
+    character_manager.migrate_flat_saves(str(tmp_path))
+    for i in range(100):
+        character_manager.save_character(make_character(f"Temp{i}"), str(tmp_path))
+        character_manager.delete_character(f"Temp{i}", str(tmp_path))
+    character_manager.save_character(make_character(), str(tmp_path))
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["SaveTest"]
+    index = (tmp_path / character_manager.SAVE_INDEX).read_text()
+    assert index == "+SaveTest\n"
+
+# ============================================================================
+# SAVE STORE TESTS
+# ============================================================================
+
+def test_save_store_round_trip(tmp_path):
+    """Test saving, loading, listing and deleting through a SaveStore"""
+    path = str(tmp_path / "saves.store")
+    with character_manager.SaveStore(path, sync=False) as store:
+        char = make_character()
+        store.save(char)
+        char['gold'] = 7
+        store.save(char)
+        store.save(make_character("Other"))
+        store.delete("Other")
+
+        assert store.load("SaveTest") == char
+        assert store.names() == ["SaveTest"]
+        with pytest.raises(character_manager.CharacterNotFoundError):
+            store.load("Other")
+
+    with character_manager.SaveStore(path) as reopened:
+        assert reopened.load("SaveTest")['gold'] == 7
+        assert len(reopened) == 1
+
+def test_save_store_routes_module_functions(tmp_path):
+    """Test that the module-level save functions use the configured backend"""
+    store = character_manager.SaveStore(str(tmp_path / "saves.store"), sync=False)
+    previous = character_manager.set_save_backend(store)
+    try:
+        character_manager.save_character(make_character("Routed"))
+        assert character_manager.list_saved_characters() == ["Routed"]
+        assert character_manager.load_character("Routed")['name'] == "Routed"
+        assert character_manager.delete_character("Routed")
+        assert character_manager.list_saved_characters() == []
+    finally:
+        character_manager.set_save_backend(previous)
+        store.close()
+    assert os.listdir(tmp_path) == ["saves.store"]
+
+def test_save_store_compacts(tmp_path):
+    """Test that compaction keeps only the latest saves"""
+    path = tmp_path / "saves.store"
+    with character_manager.SaveStore(str(path), sync=False) as store:
+        char = dict(make_character())
+        for gold in range(50):
+            char['gold'] = gold
+            store.save(char)
+        store.save(make_character("Gone"))
+        store.delete("Gone")
+        size = path.stat().st_size
+
+        store.compact()
+
+        assert path.stat().st_size < size / 10
+        assert store.dead_bytes == 0
+        assert store.load("SaveTest")['gold'] == 49
+        store.save(make_character("After"))
+        assert store.names() == ["SaveTest", "After"]
+
+def test_save_store_trims_torn_record(tmp_path):
+    """Test that a record cut short by a crash is dropped on open"""
+    path = tmp_path / "saves.store"
+    with character_manager.SaveStore(str(path)) as store:
+        char = make_character()
+        store.save(char)
+        char['gold'] = 500
+        store.save(char)
+    with open(path, "r+b") as file:
+        file.truncate(path.stat().st_size - 10)
+
+    with character_manager.SaveStore(str(path)) as store:
+        assert store.load("SaveTest")['gold'] == 100
+        store.save(make_character("Next"))
+        assert store.names() == ["SaveTest", "Next"]
+
+def test_save_store_rejects_damage_before_the_tail(tmp_path):
+    """Test that a bad record followed by more records is not trimmed away"""
+    path = tmp_path / "saves.store"
+    with character_manager.SaveStore(str(path)) as store:
+        store.save(make_character("First"))
+        store.save(make_character("Second"))
+    data = bytearray(path.read_bytes())
+    data[len(character_manager.STORE_MAGIC)] = ord("?")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(character_manager.SaveFileCorruptedError):
+        character_manager.SaveStore(str(path))
+    assert path.read_bytes() == bytes(data)
+
+def test_save_store_rejects_bad_length_in_the_middle(tmp_path):
+    """Test that a corrupted length field is not mistaken for a torn tail"""
+    path = tmp_path / "saves.store"
+    with character_manager.SaveStore(str(path)) as store:
+        for name in ("First", "Second", "Third"):
+            store.save(make_character(name))
+        second = store._index["Second"][0]
+    data = bytearray(path.read_bytes())
+    record_start = second[0] + second[1] - second[2]
+    length_field = record_start + character_manager.STORE_RECORD_START - 4
+    data[length_field + 2] ^= 0x01
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(character_manager.SaveFileCorruptedError):
+        character_manager.SaveStore(str(path))
+    assert path.read_bytes() == bytes(data)
+
+def test_save_store_trims_damaged_last_record(tmp_path):
+    """Test that a last record failing its CRC is trimmed like a torn one"""
+    path = tmp_path / "saves.store"
+    with character_manager.SaveStore(str(path)) as store:
+        char = make_character()
+        store.save(char)
+        char['gold'] = 500
+        store.save(char)
+    data = bytearray(path.read_bytes())
+    data[-3] ^= 0x01
+    path.write_bytes(bytes(data))
+
+    with character_manager.SaveStore(str(path)) as store:
+        assert store.load("SaveTest")['gold'] == 100
+
+# ============================================================================
+# SQLITE STORE TESTS
+# ============================================================================
+
+def test_sqlite_store_bulk_upsert_and_query(tmp_path):
+    """Test save_many upserts and level queries in the SQLite store"""
+    with character_manager.SQLiteSaveStore(str(tmp_path / "saves.db")) as store:
+        party = [make_character(f"Hero{i}") for i in range(5)]
+        for i, char in enumerate(party):
+            char['level'] = i + 1
+        store.save_many(party)
+        party[0]['level'] = 9
+        store.save_many(party[:1])
+
+        assert len(store) == 5
+        assert store.names() == [f"Hero{i}" for i in range(5)]
+        assert [c['name'] for c in store.characters_above_level(3)] == ["Hero0", "Hero4", "Hero3"]
+        assert store.load("Hero2") == party[2]
+        assert store.delete("Hero2") and "Hero2" not in store
+        with pytest.raises(character_manager.CharacterNotFoundError):
+            store.load("Hero2")
+
+def test_sqlite_store_rejects_invalid_character(tmp_path):
+    """Test that rows are checked with validate_character_data"""
+    with character_manager.SQLiteSaveStore(str(tmp_path / "saves.db")) as store:
+        char = make_character()
+        del char['gold']
+        with pytest.raises(character_manager.InvalidSaveDataError):
+            store.save(char)
+        assert len(store) == 0
+
+@pytest.mark.parametrize("scenario", [
+    "test_character_creation_and_saving",
+    "test_complete_game_workflow",
+])
+def test_sqlite_store_passes_integration_scenarios(tmp_path, scenario):
+    """Test the integration save/load scenarios against the SQLite backend"""
+    import test_game_integration
+    store = character_manager.SQLiteSaveStore(str(tmp_path / "saves.db"))
+    previous = character_manager.set_save_backend(store)
+    try:
+        getattr(test_game_integration, scenario)()
+        assert store.names() == []
+    finally:
+        character_manager.set_save_backend(previous)
+        store.close()
+
+def test_save_characters_without_backend(tmp_path):
+    """Test that save_characters falls back to batched save files"""
+    party = [make_character("Ann"), make_character("Bob")]
+
+    assert character_manager.save_characters(party, str(tmp_path))
+
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["Ann", "Bob"]
+
+# ============================================================================
+# DELTA SAVE TESTS
+# ============================================================================
+
+def test_tracked_character_records_changes():
+    """Test that game operations mark the fields they change"""
+    import inventory_system
+    import quest_handler
+    char = make_character()
+    char.dirty.clear()
+
+    character_manager.add_gold(char, 5)
+    character_manager.gain_experience(char, 10)
+    inventory_system.add_item_to_inventory(char, 'health_potion')
+    quest_handler.abandon_quest(char, 'first_steps')
+
+    assert char.dirty == {'gold', 'experience', 'inventory', 'active_quests'}
+
+def test_save_store_writes_deltas(tmp_path):
+    """Test that a tracked character only appends its changed fields"""
+    path = tmp_path / "saves.store"
+    with character_manager.SaveStore(str(path), sync=False) as store:
+        char = make_character()
+        store.save(char)
+        full_size = path.stat().st_size
+
+        character_manager.add_gold(char, 5)
+        store.save(char)
+        delta_size = path.stat().st_size - full_size
+        store.save(char)
+
+        assert delta_size < (full_size - len(character_manager.STORE_MAGIC)) / 5
+        assert path.stat().st_size == full_size + delta_size
+        assert not char.dirty
+        assert store.load("SaveTest") == char
+
+    with character_manager.SaveStore(str(path)) as reopened:
+        loaded = reopened.load("SaveTest")
+        assert loaded == char
+
+        loaded['level'] = 4
+        reopened.save(loaded)
+        reopened.compact()
+        assert reopened.load("SaveTest")['level'] == 4
+        assert reopened.load("SaveTest")['gold'] == 105
+
+def test_save_store_checkpoints_delta_chains(tmp_path):
+    """Test that a full save is written after STORE_CHECKPOINT_EVERY deltas"""
+    with character_manager.SaveStore(str(tmp_path / "saves.store"), sync=False) as store:
+        char = make_character()
+        store.save(char)
+        for gold in range(character_manager.STORE_CHECKPOINT_EVERY + 1):
+            char['gold'] = gold
+            store.save(char)
+
+        assert len(store._index["SaveTest"]) == 1
+        assert store.load("SaveTest")['gold'] == character_manager.STORE_CHECKPOINT_EVERY
+
+def test_untracked_character_saves_in_full(tmp_path):
+    """Test that plain dictionaries and characters from elsewhere save in full"""
+    with character_manager.SaveStore(str(tmp_path / "saves.store"), sync=False) as store:
+        char = make_character()
+        store.save(char)
+        plain = dict(char, gold=1)
+        store.save(plain)
+        assert len(store._index["SaveTest"]) == 1
+
+        character_manager.save_character(char, str(tmp_path))
+        store.save(char)
+        assert len(store._index["SaveTest"]) == 1
+        assert store.load("SaveTest")['gold'] == 100
+
+# ============================================================================
+# SAVE QUEUE TESTS
+# ============================================================================
+
+def gated_saver():
+    """Save function that waits for a gate and records what it saved"""
+    import threading
+    gate = threading.Event()
+    saved = []
+    def save(character):
+        gate.wait(5)
+        saved.append((character['name'], character['gold']))
+    return gate, saved, save
+
+def test_save_queue_coalesces_and_snapshots():
+    """Test that waiting saves of one character are merged into the latest"""
+    gate, saved, save = gated_saver()
+    queue = character_manager.SaveQueue(save)
+    first = make_character("First")
+    second = make_character("Second")
+
+    queue.put(first)
+    for gold in (1, 2, 3):
+        second['gold'] = gold
+        queue.put(second)
+    second['gold'] = 99
+    gate.set()
+
+    assert queue.drain(timeout=5)
+    assert saved == [("First", 100), ("Second", 3)]
+
+def test_save_queue_keeps_place_of_requeued_character():
+    """Test that saving a waiting character again does not move it back"""
+    gate, saved, save = gated_saver()
+    queue = character_manager.SaveQueue(save)
+    characters = [make_character(f"c{i}") for i in range(5)]
+
+    for character in characters:
+        queue.put(character)
+    characters[1]['gold'] = 7
+    queue.put(characters[1])
+    gate.set()
+
+    assert queue.drain(timeout=5)
+    assert saved == [("c0", 100), ("c1", 7), ("c2", 100), ("c3", 100), ("c4", 100)]
+
+def test_save_queue_applies_backpressure():
+    """Test that put waits while max_pending characters are queued"""
+    gate, saved, save = gated_saver()
+    queue = character_manager.SaveQueue(save, max_pending=1)
+
+    queue.put(make_character("Busy"))
+    assert queue.flush(timeout=0.01) is False
+    queue.put(make_character("Waiting"))
+    assert queue.put(make_character("Blocked"), timeout=0.05) is False
+    assert queue.put(make_character("Waiting"), timeout=0.05) is True
+
+    gate.set()
+    assert queue.drain(timeout=5)
+    with pytest.raises(RuntimeError):
+        queue.put(make_character("Late"))
+
+def test_save_queue_reports_failures(tmp_path):
+    """Test that failed saves reach on_error and keep the fields dirty"""
+    failures = []
+    def save(character):
+        raise IOError("disk full")
+    queue = character_manager.SaveQueue(save, on_error=lambda name, e: failures.append((name, e)))
+    char = make_character()
+    char.dirty.clear()
+    char['gold'] = 5
+
+    queue.put(char)
+    assert not char.dirty
+    queue.drain(timeout=5)
+
+    assert [(name, str(e)) for name, e in failures] == [("SaveTest", "disk full")]
+    assert char.dirty == {'gold'}
+
+def test_save_queue_survives_failing_error_callback():
+    """Test that an on_error that raises does not stop the worker"""
+    saved = []
+    def save(character):
+        if character['name'] == "Bad":
+            raise IOError("disk full")
+        saved.append(character['name'])
+    def on_error(name, error):
+        raise RuntimeError("reporting failed")
+    queue = character_manager.SaveQueue(save, on_error=on_error)
+
+    queue.put(make_character("Bad"))
+    queue.put(make_character("Good"))
+
+    assert queue.drain(timeout=5)
+    assert saved == ["Good"]
+    assert [(name, str(e)) for name, e in queue.errors] == [("Bad", "disk full")]
+
+def test_failed_save_fields_reach_the_next_queued_save(tmp_path):
+    """Test that a failed delta save is not lost behind a newer queued save"""
+    import threading
+    store = character_manager.SaveStore(str(tmp_path / "saves.store"), sync=False)
+    started = threading.Event()
+    gate = threading.Event()
+    def save(character):
+        if character['gold'] == 500 and not gate.is_set():
+            started.set()
+            gate.wait(5)
+            raise IOError("disk full")
+        store.save(character)
+    queue = character_manager.SaveQueue(save, on_error=lambda name, e: None)
+    char = make_character()
+    queue.put(char)
+    queue.flush(timeout=5)
+
+    char['gold'] = 500
+    queue.put(char)
+    assert started.wait(5)
+    char['level'] = 3
+    queue.put(char)
+    gate.set()
+    queue.drain(timeout=5)
+
+    loaded = store.load("SaveTest")
+    assert (loaded['level'], loaded['gold']) == (3, 500)
+    store.close()
+
+def test_save_queue_writes_save_files(tmp_path):
+    """Test the queue with the default save function and a save store"""
+    store = character_manager.SaveStore(str(tmp_path / "saves.store"), sync=False)
+    previous = character_manager.set_save_backend(store)
+    try:
+        queue = character_manager.SaveQueue()
+        char = make_character()
+        queue.put(char)
+        queue.flush(timeout=5)
+        character_manager.add_gold(char, 5)
+        queue.put(char)
+        queue.drain(timeout=5)
+
+        assert queue.errors == []
+        assert character_manager.load_character("SaveTest")['gold'] == 105
+        assert len(store._index["SaveTest"]) == 2
+    finally:
+        character_manager.set_save_backend(previous)
+        store.close()
+
+# ============================================================================
+# SAVE PARSER TESTS
+# ============================================================================
+
+def test_parser_matches_saved_character(tmp_path):
+    """Test that the bytes parser rebuilds exactly what was saved"""
+    char = make_character()
+    char['completed_quests'].extend(['a', 'b'])
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+
+    assert loaded == char
+    assert isinstance(loaded['active_quests'], character_manager.QuestList)
+    assert not loaded.dirty
+
+@pytest.mark.parametrize("text, message", [
+    (LEGACY_SAVE.replace("Gold: 100", "Gold: lots"), "format is invalid"),
+    (LEGACY_SAVE.replace("Gold: 100\n", ""), "Missing gold"),
+    (LEGACY_SAVE.replace("Gold", "Coins"), "Wrong field Coins"),
+    (LEGACY_SAVE + "no colon here\n", "format is invalid"),
+])
+def test_parser_rejects_bad_saves(tmp_path, text, message):
+    """Test that malformed saves still raise InvalidSaveDataError"""
+    (tmp_path / "SaveTest_save.txt").write_text(text)
+
+    with pytest.raises(character_manager.InvalidSaveDataError, match=message):
+        character_manager.load_character("SaveTest", str(tmp_path))
+
+def test_load_characters_reports_each_name(tmp_path):
+    """Test bulk loading with missing and damaged saves mixed in"""
+    for name in ("Ann", "Bob"):
+        character_manager.save_character(make_character(name), str(tmp_path))
+    (tmp_path / "Bad_save.txt").write_text("garbage\n")
+
+    loaded = character_manager.load_characters(["Ann", "Ghost", "Bad", "Bob"], str(tmp_path))
+
+    assert list(loaded) == ["Ann", "Ghost", "Bad", "Bob"]
+    assert loaded["Ann"]['name'] == "Ann" and loaded["Bob"]['name'] == "Bob"
+    assert isinstance(loaded["Ghost"], character_manager.CharacterNotFoundError)
+    assert isinstance(loaded["Bad"], character_manager.InvalidSaveDataError)
+
+    character_manager.migrate_flat_saves(str(tmp_path))
+    assert character_manager.load_characters(["Bob"], str(tmp_path))["Bob"]['name'] == "Bob"
+
+def test_load_characters_from_sqlite(tmp_path):
+    """Test that bulk loading uses the backend's load_many"""
+    store = character_manager.SQLiteSaveStore(str(tmp_path / "saves.db"))
+    previous = character_manager.set_save_backend(store)
+    try:
+        character_manager.save_characters([make_character(f"Hero{i}") for i in range(3)])
+
+        loaded = character_manager.load_characters(["Hero2", "Nobody", "Hero0"])
+
+        assert loaded["Hero2"]['name'] == "Hero2" and loaded["Hero0"]['name'] == "Hero0"
+        assert isinstance(loaded["Nobody"], character_manager.CharacterNotFoundError)
+    finally:
+        character_manager.set_save_backend(previous)
+        store.close()
+
+# ============================================================================
+# BINARY SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_saves_round_trip(tmp_path):
+    """Test that binary saves load back the same character and are smaller"""
+    char = make_character()
+    char['completed_quests'].extend(['goblin_hunter', 'équipement'])
+    character_manager.save_character(char, str(tmp_path / "text"))
+    previous = character_manager.set_binary_saves(True)
+    try:
+        character_manager.save_character(char, str(tmp_path / "binary"))
+    finally:
+        character_manager.set_binary_saves(previous)
+
+    text_file = tmp_path / "text" / "SaveTest_save.txt"
+    binary_file = tmp_path / "binary" / "SaveTest_save.txt"
+    assert binary_file.read_bytes().startswith(character_manager.BINARY_MAGIC)
+    assert binary_file.stat().st_size < text_file.stat().st_size
+    assert character_manager.load_character("SaveTest", str(tmp_path / "binary")) == char
+
+def test_binary_save_errors(tmp_path):
+    """Test that damaged or newer binary saves raise InvalidSaveDataError"""
+    data = character_manager._format_binary_save(make_character())
+    version = character_manager.BINARY_VERSION_OFFSET
+
+    for damaged in (data[:-3], data + b"x", data[:20], data[:version] + b"\x09" + data[version + 1:]):
+        (tmp_path / "SaveTest_save.txt").write_bytes(damaged)
+        with pytest.raises(character_manager.InvalidSaveDataError):
+            character_manager.load_character("SaveTest", str(tmp_path))
+
+def test_binary_saves_hold_veteran_characters(tmp_path):
+    """Test long quest lists and stats beyond 32 bits"""
+    char = make_character()
+    char['completed_quests'].extend(f"quest_number_{i}" for i in range(6000))
+    char['gold'] = 2 ** 40
+    data = character_manager._format_binary_save(char)
+
+    assert character_manager._parse_save(data) == char
+
+def test_convert_saves_both_ways(tmp_path):
+    """Test the bulk converter between the text and binary formats"""
+    for name in ("Ann", "Bob"):
+        character_manager.save_character(make_character(name), str(tmp_path))
+    before = character_manager.load_characters(["Ann", "Bob"], str(tmp_path))
+
+    assert character_manager.convert_saves(str(tmp_path)) == 2
+    assert character_manager.convert_saves(str(tmp_path)) == 0
+    assert (tmp_path / "Ann_save.txt").read_bytes().startswith(character_manager.BINARY_MAGIC)
+    assert character_manager.load_characters(["Ann", "Bob"], str(tmp_path)) == before
+
+    assert character_manager.convert_saves(str(tmp_path), binary=False) == 2
+    assert (tmp_path / "Bob_save.txt").read_text().startswith("Name: Bob")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])